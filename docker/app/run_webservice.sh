@@ -1,5 +1,7 @@
 #!/usr/bin/env sh
 
 echo "Running The Webservice..."
-/usr/local/bin/gunicorn --bind 0.0.0.0:9001 --workers 1 --worker-class gevent clickandobey.dockerized.webservice.api.app:API
-echo "The Webservice has finished."
\ No newline at end of file
+# Exec so the gunicorn master receives the signals sent to the container, and drains its workers on SIGTERM.
+exec /usr/local/bin/gunicorn \
+    --config python:clickandobey.dockerized.webservice.server.gunicorn_config \
+    clickandobey.dockerized.webservice.api.app:API
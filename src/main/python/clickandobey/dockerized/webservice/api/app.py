@@ -3,36 +3,54 @@ Module used to define the flask application used for running the webservice.
 """
 
 import logging
+
+from functools import partial
 from flask import Blueprint, Flask
 from flask_cors import CORS
 from flask_restplus import Api
 
 from clickandobey.dockerized.webservice.api.endpoints.admin.configuration import NAMESPACE as CONFIGURATION_NAMESPACE
+from clickandobey.dockerized.webservice.api.endpoints.admin.metrics import NAMESPACE as METRICS_NAMESPACE
 from clickandobey.dockerized.webservice.api.endpoints.admin.status import NAMESPACE as STATUS_NAMESPACE
+from clickandobey.dockerized.webservice.api.endpoints.batch.batch import NAMESPACE as BATCH_NAMESPACE
 from clickandobey.dockerized.webservice.api.endpoints.hello.hello import NAMESPACE as HELLO_NAMESPACE
+from clickandobey.dockerized.webservice.api.errors import (
+    SampledErrorsFlask,
+    register_api_error_handler,
+    register_flask_error_handler,
+)
 from clickandobey.dockerized.webservice.api.logger import LOGGER
 from clickandobey.dockerized.webservice.configuration.webservice_configuration import get_configuration
-from clickandobey.dockerized.webservice.metrics.metrics_collector import initialize_metrics_collector
+from clickandobey.dockerized.webservice.metrics.history import MetricsHistory
+from clickandobey.dockerized.webservice.metrics.metrics_collector import (
+    initialize_metrics_collector,
+    reinitialize_metrics_collector,
+)
+from clickandobey.dockerized.webservice.server.lifecycle import (
+    register_post_fork,
+    register_shutdown,
+    request_finished,
+    request_started,
+)
+
+# Paths requested once before serving, so lazily built state (i.e. the Swagger specs) is built up front.
+WARM_UP_PATHS = (
+    "/admin/swagger.json",
+    "/swagger.json",
+)
 
 
 def __create_admin_api(flask_app: Flask) -> None:
     api = Api(version=get_configuration().version,
               title='Webservice - Admin',
               description='Administrative tasks for the Webservice.')
-
-    @api.errorhandler
-    # pylint: disable=unused-argument
-    # pylint: disable=unused-variable
-    def default_error_handler(exception):
-        """
-        Error handler for the Restplus API.
-        """
-        return
+    register_api_error_handler(api)
 
     blueprint = Blueprint('admin', __name__)
     api.init_app(blueprint)
     api.add_namespace(CONFIGURATION_NAMESPACE)
     api.add_namespace(STATUS_NAMESPACE)
+    api.add_namespace(METRICS_NAMESPACE)
     flask_app.register_blueprint(blueprint, url_prefix='/admin')
 
 
@@ -40,19 +58,12 @@ def __create_hello_world_api(flask_app: Flask) -> None:
     api = Api(version=get_configuration().version,
               title='Webservice - Hello World',
               description='Hello World Endpoints for the Webservice.')
-
-    @api.errorhandler
-    # pylint: disable=unused-argument
-    # pylint: disable=unused-variable
-    def default_error_handler(exception):
-        """
-        Error handler for the Restplus API.
-        """
-        return
+    register_api_error_handler(api)
 
     blueprint = Blueprint('hello', __name__)
     api.init_app(blueprint)
     api.add_namespace(HELLO_NAMESPACE)
+    api.add_namespace(BATCH_NAMESPACE)
     flask_app.register_blueprint(blueprint, url_prefix='')
 
 
@@ -61,13 +72,27 @@ def create_flask_app(logger: logging.Logger) -> Flask:
     Create our flask app and return it.
     """
     logger.info("Creating Webservice...")
-    flask_app = Flask(__name__)
+    flask_app = SampledErrorsFlask(__name__)
     CORS(flask_app)
 
     # Register our endpoints.
     __create_admin_api(flask_app)
     __create_hello_world_api(flask_app)
-    initialize_metrics_collector(logger=LOGGER)
+    register_flask_error_handler(flask_app, logger)
+    settings = get_configuration().settings
+    metrics_history = MetricsHistory(
+        settings.metrics_history_directory,
+        settings.metrics_history_capacity,
+        logger=LOGGER,
+    )
+    initialize_metrics_collector(logger=LOGGER, history=metrics_history)
+    register_post_fork(metrics_history.reset)
+    register_post_fork(partial(reinitialize_metrics_collector, LOGGER, metrics_history))
+    register_shutdown(partial(metrics_history.flush, force=True))
+
+    # Track the in-flight requests, so draining workers know when they are done.
+    flask_app.before_request(request_started)
+    flask_app.teardown_request(lambda exception: request_finished())
 
     # Make sure to setup the app with our intended logging mechanism.
     for handler in logger.handlers:
@@ -78,4 +103,17 @@ def create_flask_app(logger: logging.Logger) -> Flask:
     return flask_app
 
 
+def warm_up(flask_app: Flask, logger: logging.Logger) -> None:
+    """
+    Warm up the given flask app by requesting each of the warm up paths once.
+    """
+    logger.info("Warming up Webservice...")
+    with flask_app.test_client() as client:
+        for path in WARM_UP_PATHS:
+            response = client.get(path)
+            if response.status_code != 200:
+                logger.warning("Failed to warm up %s: %i", path, response.status_code)
+    logger.info("Webservice warmed up.")
+
+
 API = create_flask_app(LOGGER)
@@ -20,8 +20,4 @@ class Configuration(Resource):
         """
         Returns our configuration.
         """
-        try:
-            configuration_info = get_configuration()
-        except Exception as error:
-            return 400, str(error)
-        return configuration_info.to_dict(), 200
+        return get_configuration().to_dict(), 200
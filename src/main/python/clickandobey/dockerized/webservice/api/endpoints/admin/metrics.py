@@ -0,0 +1,45 @@
+"""
+Module used to define the metrics history endpoint for our flask app.
+"""
+
+from flask_restplus import Resource, Namespace, reqparse
+
+from clickandobey.dockerized.webservice.configuration.webservice_configuration import get_configuration
+from clickandobey.dockerized.webservice.metrics.history import RESOLUTIONS_SECONDS, read_history
+
+NAMESPACE = Namespace('metrics', description='Operations Related to Metrics History')
+
+HISTORY_PARSER = reqparse.RequestParser()
+HISTORY_PARSER.add_argument('window', type=int, default=300, help='Amount of seconds of history to return.')
+HISTORY_PARSER.add_argument('resolution', type=int, default=1, choices=RESOLUTIONS_SECONDS,
+                            help='Resolution of the history, in seconds.')
+
+
+@NAMESPACE.route('/<path:metric>')
+@NAMESPACE.response(400, 'Invalid history parameters.')
+class MetricHistory(Resource):
+    """
+    Endpoint used to get the recent history of a metric, merged across every worker.
+    """
+
+    @NAMESPACE.expect(HISTORY_PARSER)
+    def get(self, metric: str):
+        """
+        Returns the history of the given metric.
+        """
+        args = HISTORY_PARSER.parse_args()
+        if args.window <= 0:
+            raise ValueError("Invalid window. Must be a positive amount of seconds.")
+
+        points = read_history(
+            get_configuration().settings.metrics_history_directory,
+            metric,
+            window_seconds=args.window,
+            resolution=args.resolution,
+        )
+        history_info = {
+            "Metric": metric,
+            "Resolution": args.resolution,
+            "Points": points,
+        }
+        return history_info, 200
@@ -4,12 +4,14 @@ Module used to define the status endpoint for our flask app.
 
 from flask_restplus import Resource, Namespace
 
+from clickandobey.dockerized.webservice.server.lifecycle import get_in_flight_requests, is_ready
 
 NAMESPACE = Namespace('status', description='Operations Related to Application Status')
 
 
 @NAMESPACE.route('')
 @NAMESPACE.response(404, 'Job not found.')
+@NAMESPACE.response(503, 'Not ready to accept new requests, i.e. warming up or draining.')
 class Status(Resource):
     """
     Endpoint used to get status information about the flask app. i.e. running/healthy.
@@ -19,10 +21,10 @@ class Status(Resource):
         """
         Returns our health status.
         """
-        try:
-            status_info = {
-                "Running": True,
-            }
-        except Exception as error:
-            return 400, str(error)
-        return status_info, 200
+        ready = is_ready()
+        status_info = {
+            "Running": True,
+            "Ready": ready,
+            "InFlightRequests": get_in_flight_requests(),
+        }
+        return status_info, 200 if ready else 503
@@ -0,0 +1,160 @@
+"""
+Module used to define the batch endpoint for our flask app.
+"""
+
+import json
+
+from concurrent.futures import ThreadPoolExecutor, wait
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from flask import Flask, current_app, request
+from flask_restplus import Resource, Namespace, fields
+from werkzeug.test import EnvironBuilder
+
+from clickandobey.dockerized.webservice.api.logger import LOGGER
+from clickandobey.dockerized.webservice.configuration.webservice_configuration import get_configuration
+from clickandobey.dockerized.webservice.metrics.metrics_collector import MetricsTimer, publish_count
+from clickandobey.dockerized.webservice.server.lifecycle import register_post_fork
+
+NAMESPACE = Namespace('batch', description='Batch API')
+
+SUB_REQUEST_MODEL = NAMESPACE.model('SubRequest', {
+    'path': fields.String(required=True, description='Path (and query string) of the GET request, i.e. /hello.'),
+})
+BATCH_MODEL = NAMESPACE.model('Batch', {
+    'requests': fields.List(fields.Nested(SUB_REQUEST_MODEL), required=True, description='Requests to execute.'),
+})
+
+# Headers describing the batch request body, which must not be forwarded to the sub-requests.
+_EXCLUDED_HEADERS = {"content-type", "content-length"}
+
+__EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # Gevent workers monkey patch threading, in which case the threads of the pool are greenlets.
+    global __EXECUTOR
+
+    if __EXECUTOR is None:
+        __EXECUTOR = ThreadPoolExecutor(
+            max_workers=get_configuration().settings.batch_pool_size,
+            thread_name_prefix="batch",
+        )
+    return __EXECUTOR
+
+
+@register_post_fork
+def _reset_executor() -> None:
+    # The threads of the pool don't survive forking, so workers need a pool of their own.
+    global __EXECUTOR
+
+    __EXECUTOR = None
+
+
+def _dispatch(flask_app: Flask, path: str, headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Dispatch a GET request through the flask app without going through the network.
+    """
+    url = urlsplit(path)
+    environ = EnvironBuilder(path=url.path, query_string=url.query, method="GET", headers=headers).get_environ()
+    with flask_app.request_context(environ):
+        try:
+            response = flask_app.full_dispatch_request()
+        except Exception as error:
+            response = flask_app.make_response(flask_app.handle_exception(error))
+
+    return {
+        "status": response.status_code,
+        "body": response.get_data(),
+        "json": response.is_json,
+    }
+
+
+def _validate_paths(sub_requests: List[Dict[str, str]]) -> List[str]:
+    settings = get_configuration().settings
+    if not sub_requests:
+        raise ValueError("Invalid batch. Must contain at least one request.")
+    if len(sub_requests) > settings.batch_max_requests:
+        raise ValueError(f"Invalid batch. Must contain at most {settings.batch_max_requests} requests.")
+
+    paths = [sub_request["path"] for sub_request in sub_requests]
+    for path in paths:
+        if not path.startswith("/") or urlsplit(path).netloc:
+            raise ValueError(f"Invalid path {path}. Must be an absolute path of the webservice.")
+        if urlsplit(path).path.rstrip("/") == f"/{NAMESPACE.name}":
+            raise ValueError(f"Invalid path {path}. Batches can't be nested.")
+    return paths
+
+
+@NAMESPACE.route('')
+@NAMESPACE.response(400, 'Invalid batch.')
+class Batch(Resource):
+    """
+    Endpoint used to execute several GET requests concurrently in a single round-trip.
+    """
+
+    @NAMESPACE.expect(BATCH_MODEL, validate=True)
+    def post(self):
+        """
+        Execute the given requests and return their responses, in order.
+        """
+        paths = _validate_paths(request.get_json()["requests"])
+        settings = get_configuration().settings
+        headers = {key: value for key, value in request.headers.items() if key.lower() not in _EXCLUDED_HEADERS}
+        # pylint: disable=protected-access
+        flask_app = current_app._get_current_object()
+
+        publish_count("Batch Size", "Amount of requests per batch.", len(paths))
+        with MetricsTimer("Batch Fan-Out Timer"):
+            futures = [_get_executor().submit(_dispatch, flask_app, path, headers) for path in paths]
+            wait(futures, timeout=settings.batch_timeout_seconds)
+
+        responses = []
+        remaining_bytes = settings.batch_max_response_bytes
+        abandoned_requests = 0
+        for path, future in zip(paths, futures):
+            if not future.done():
+                # Requests already running can't be cancelled, and keep their slot of the pool until they finish.
+                if not future.cancel():
+                    abandoned_requests += 1
+                responses.append(_error_response(path, HTTPStatus.GATEWAY_TIMEOUT, "Request timed out."))
+                continue
+
+            response = future.result()
+            if len(response["body"]) > remaining_bytes:
+                responses.append(
+                    _error_response(path, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Batch response too large.")
+                )
+                continue
+
+            remaining_bytes -= len(response["body"])
+            responses.append({"path": path, "status": response["status"], "body": _decode_body(response)})
+
+        if abandoned_requests:
+            LOGGER.warning(
+                "Abandoned %i timed out batch requests still holding a slot of the pool.", abandoned_requests
+            )
+            publish_count(
+                "Batch Abandoned Requests",
+                "Amount of timed out requests per batch left running in the pool.",
+                abandoned_requests,
+            )
+
+        return {"responses": responses}, 200
+
+
+def _decode_body(response: Dict[str, Any]) -> Any:
+    body = response["body"].decode("utf-8", errors="replace")
+    if not response["json"] or not body:
+        return body
+    try:
+        return json.loads(body)
+    except ValueError:
+        # Endpoints claiming JSON without returning it are reported as is, rather than failing the whole batch.
+        return body
+
+
+def _error_response(path: str, status: HTTPStatus, message: str) -> Dict[str, Any]:
+    return {"path": path, "status": int(status), "body": {"message": message}}
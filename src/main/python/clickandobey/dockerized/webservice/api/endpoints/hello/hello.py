@@ -20,9 +20,5 @@ class HELLO(Resource):
         """
         Return hello world information.
         """
-        try:
-            with MetricsTimer("Hello World Timer"):
-                return {"hello": "world"}, 200
-
-        except Exception as error:
-            return 400, str(error)
+        with MetricsTimer("Hello World Timer"):
+            return {"hello": "world"}, 200
@@ -0,0 +1,187 @@
+"""
+Module used to define the error handling pipeline shared by the apis of the webservice.
+"""
+
+import json
+import logging
+import threading
+
+from functools import lru_cache
+from http import HTTPStatus
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+from flask import Flask, Response, request
+from flask_restplus import Api
+from werkzeug.exceptions import HTTPException
+
+from clickandobey.dockerized.webservice.api.logger import LOGGER
+from clickandobey.dockerized.webservice.logging.log_filter import SAMPLED_ATTRIBUTE
+from clickandobey.dockerized.webservice.metrics.metrics_collector import publish_error
+
+# Exceptions not listed here (and not HTTPExceptions) are treated as internal server errors. Lookups walk the MRO, so
+# subclasses map to the status of their closest listed parent.
+STATUS_CODES_BY_EXCEPTION = {
+    ValueError: HTTPStatus.BAD_REQUEST,
+    NotImplementedError: HTTPStatus.NOT_IMPLEMENTED,
+    TimeoutError: HTTPStatus.GATEWAY_TIMEOUT,
+}
+
+__UNMATCHED_ROUTE = "unmatched"
+__FORWARDED_HEADERS_EXCLUDED = {"content-type", "content-length"}
+# Error logs are already sampled per route and exception, so the rate limiting log filter must leave them alone.
+__SAMPLED_EXTRA = {SAMPLED_ATTRIBUTE: True}
+
+
+class ErrorLogSampler:
+    """
+    Adaptive sampler used to decide which errors get logged. Within each window, the first `burst` occurrences of an
+    error key are logged, after which only occurrences whose count is a power of two are, so an error storm produces a
+    logarithmic amount of log lines instead of a linear one.
+    """
+
+    def __init__(self, burst: int = 10, window_seconds: float = 1.0):
+        self.__burst = burst
+        self.__window_seconds = window_seconds
+        self.__lock = threading.Lock()
+        self.__window_start = monotonic()
+        self.__occurrences: Dict[str, int] = {}
+        self.__suppressed = 0
+
+    def sample(self, key: str) -> Tuple[bool, int]:
+        """
+        Record an occurrence of the given error key.
+        :param key: The key used to group errors together, i.e. the route and exception class.
+        :return: Whether this occurrence should be logged, and the amount of occurrences suppressed in the previous
+                 window if this occurrence started a new one (0 otherwise).
+        """
+        with self.__lock:
+            previously_suppressed = 0
+            now = monotonic()
+            if now - self.__window_start >= self.__window_seconds:
+                previously_suppressed = self.__suppressed
+                self.__window_start = now
+                self.__occurrences = {}
+                self.__suppressed = 0
+
+            occurrences = self.__occurrences.get(key, 0) + 1
+            self.__occurrences[key] = occurrences
+            should_log = occurrences <= self.__burst or occurrences & (occurrences - 1) == 0
+            if not should_log:
+                self.__suppressed += 1
+
+            return should_log, previously_suppressed
+
+
+__SAMPLER = ErrorLogSampler()
+
+
+@lru_cache(maxsize=None)
+def _get_status_code(exception_type: type) -> int:
+    for parent in exception_type.__mro__:
+        if parent in STATUS_CODES_BY_EXCEPTION:
+            return STATUS_CODES_BY_EXCEPTION[parent]
+    return HTTPStatus.INTERNAL_SERVER_ERROR
+
+
+@lru_cache(maxsize=1024)
+def _serialize_body(message: str) -> bytes:
+    # Server errors never leak the exception message, so their bodies only depend on the status and are always cached.
+    return json.dumps({"message": message}).encode("utf-8")
+
+
+def _get_route() -> str:
+    url_rule = request.url_rule if request else None
+    return url_rule.rule if url_rule is not None else __UNMATCHED_ROUTE
+
+
+def _process_error(error: Exception) -> Tuple[int, str, Dict[str, str]]:
+    """
+    Measure and log the given error, then return the status code, message and headers that should be sent back.
+    """
+    if isinstance(error, HTTPException):
+        status_code = error.code or HTTPStatus.INTERNAL_SERVER_ERROR
+        headers = {
+            key: value for key, value in error.get_headers()
+            if key.lower() not in __FORWARDED_HEADERS_EXCLUDED
+        }
+    else:
+        status_code = _get_status_code(type(error))
+        headers = {}
+
+    route = _get_route()
+    error_name = type(error).__name__
+    publish_error(f"Error {route} {error_name}", str(error))
+
+    should_log, suppressed = __SAMPLER.sample(f"{route} {error_name}")
+    if suppressed:
+        LOGGER.warning(
+            "Suppressed logging of %i errors in the last sampling window.", suppressed, extra=__SAMPLED_EXTRA
+        )
+    if should_log:
+        if status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            LOGGER.error(
+                "%s raised while handling %s: %s", error_name, route, error, exc_info=error, extra=__SAMPLED_EXTRA
+            )
+        else:
+            LOGGER.warning("%s raised while handling %s: %s", error_name, route, error, extra=__SAMPLED_EXTRA)
+
+    if status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        message = HTTPStatus(status_code).phrase
+    elif isinstance(error, HTTPException):
+        message = error.description or HTTPStatus(status_code).phrase
+    else:
+        message = str(error) or HTTPStatus(status_code).phrase
+
+    return status_code, message, headers
+
+
+class SampledErrorsFlask(Flask):
+    """
+    Flask app leaving the logging of errors to the error pipeline. Restplus logs the traceback of every server error
+    through the app logger otherwise, unsampled, on top of the sampled logs of the pipeline.
+    """
+
+    def log_exception(self, exc_info) -> None:
+        pass
+
+
+def register_api_error_handler(api: Api) -> None:
+    """
+    Register the error pipeline for every exception raised by the resources of the given Restplus API.
+    """
+
+    @api.errorhandler(Exception)
+    # pylint: disable=unused-variable
+    def error_handler(error: Exception):
+        """
+        Error handler for the Restplus API.
+        """
+        status_code, message, headers = _process_error(error)
+        return {"message": message}, status_code, headers
+
+
+def register_flask_error_handler(flask_app: Flask, logger: Optional[logging.Logger] = None) -> None:
+    """
+    Register the error pipeline for exceptions raised outside of the Restplus APIs, i.e. unmatched routes. Bodies are
+    pre-serialized, since no Restplus representation is involved here.
+    """
+    logger = logger or LOGGER
+
+    def error_handler(error: Exception) -> Response:
+        """
+        Error handler for the flask app.
+        """
+        try:
+            status_code, message, headers = _process_error(error)
+        except Exception as ex:
+            logger.exception("Failed to process error: %s", str(ex))
+            status_code, message, headers = HTTPStatus.INTERNAL_SERVER_ERROR, "Internal Server Error", {}
+        return Response(
+            _serialize_body(message),
+            status=status_code,
+            headers=headers,
+            mimetype="application/json",
+        )
+
+    flask_app.register_error_handler(Exception, error_handler)
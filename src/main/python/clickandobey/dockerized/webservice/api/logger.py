@@ -2,7 +2,26 @@
 Module used to control the logger used by the app.
 """
 
+import logging
+
+from clickandobey.dockerized.webservice.logging.log_filter import RateLimitingFilter
 from clickandobey.dockerized.webservice.logging.logger import create_logger
 from clickandobey.dockerized.webservice.configuration.webservice_configuration import get_configuration
+from clickandobey.dockerized.webservice.metrics.metrics_collector import publish_count
+from clickandobey.dockerized.webservice.server.lifecycle import register_post_fork, register_shutdown
+
+
+def __publish_suppressed_logs(template: str, level: int, count: int) -> None:
+    publish_count(f"Suppressed Logs {logging.getLevelName(level)}", template, count)
+
+
+def __flush_logs() -> None:
+    LOG_FILTER.flush()
+    for handler in LOGGER.handlers:
+        handler.flush()
+
 
-LOGGER = create_logger(get_configuration().debug)
+LOG_FILTER = RateLimitingFilter(on_suppressed=__publish_suppressed_logs)
+LOGGER = create_logger(get_configuration().debug, LOG_FILTER)
+register_post_fork(LOG_FILTER.reset)
+register_shutdown(__flush_logs)
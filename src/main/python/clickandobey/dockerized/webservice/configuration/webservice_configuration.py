@@ -2,12 +2,147 @@
 Module used to define the base application configuration.
 """
 
+import glob
+import hashlib
 import json
 import logging
+import marshal
 import os
+import stat
+import tempfile
 import yaml
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, NamedTuple, Optional, get_type_hints
+
+# The libyaml based loader is an order of magnitude faster than the pure python one, use it whenever it is installed.
+YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)  # pylint: disable=invalid-name
+
+__CONFIGURATION_CACHE_DIRECTORY_ENV_VARIABLE = "CONFIGURATION_CACHE_DIRECTORY"
+# Per user, since cache files are unmarshalled as is and must only ever be written by the user reading them.
+__DEFAULT_CONFIGURATION_CACHE_DIRECTORY = os.path.join(tempfile.gettempdir(), f"webservice-configuration-{os.getuid()}")
+__CACHE_FILE_EXTENSION = ".marshal"
+
+
+class WebserviceSettings(NamedTuple):
+    """
+    Typed, immutable view of the configuration, validated once when the configuration is loaded. Every field declared
+    here is a key allowed in the configuration files, with its expected type and default value.
+    """
+
+    debug: bool = False
+    metrics_history_directory: str = "/webservice/flask-metrics"
+    metrics_history_capacity: int = 32768
+    batch_max_requests: int = 20
+    batch_max_response_bytes: int = 1048576
+    batch_pool_size: int = 16
+    batch_timeout_seconds: float = 5.0
+
+
+def parse_settings(config: Dict, logger: logging.Logger = logging.getLogger(__name__)) -> WebserviceSettings:
+    """
+    Validate the given configuration against the settings schema and return the settings.
+    :raises TypeError: If a value doesn't match the type declared for its key.
+    """
+    values = {}
+    types = get_type_hints(WebserviceSettings)
+    for name, expected_type in types.items():
+        if name not in config:
+            continue
+        value = config[name]
+        # Integers are valid floats, but booleans are integers too, and are never a valid number.
+        valid_types = (int, float) if expected_type is float else (expected_type,)
+        if not isinstance(value, valid_types) or (isinstance(value, bool) and expected_type is not bool):
+            raise TypeError(f"Invalid type given for {name}. Must be of type {expected_type.__name__}.")
+        values[name] = value
+
+    unknown_keys = sorted(str(key) for key in config if key not in types)
+    if unknown_keys:
+        logger.warning(f"Ignoring unknown configuration keys: {', '.join(unknown_keys)}.")
+
+    return WebserviceSettings(**values)
+
+
+def _get_cache_directory(logger: logging.Logger) -> Optional[str]:
+    cache_directory = os.getenv(__CONFIGURATION_CACHE_DIRECTORY_ENV_VARIABLE, __DEFAULT_CONFIGURATION_CACHE_DIRECTORY)
+    if not cache_directory:
+        return None
+
+    try:
+        os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+        directory_stat = os.stat(cache_directory)
+    except OSError as ex:
+        logger.warning(f"Failed to create configuration cache directory {cache_directory}: {ex}")
+        return None
+
+    # Anyone else able to write to the directory could plant a cache file, so don't trust it.
+    if directory_stat.st_uid != os.getuid() or stat.S_IMODE(directory_stat.st_mode) & 0o077:
+        logger.warning(
+            f"Ignoring configuration cache directory {cache_directory}. Must be owned by the current user and only "
+            f"accessible by them."
+        )
+        return None
+    return cache_directory
+
+
+def _get_cache_path(cache_directory: str, file_path: str, file_stat: os.stat_result) -> str:
+    # Prefixed by the hash of the path alone, so caches of previous versions of the same file can be found and pruned.
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+    cache_key = f"{os.path.abspath(file_path)}:{file_stat.st_mtime_ns}:{file_stat.st_size}"
+    cache_hash = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+    return os.path.join(cache_directory, f"{path_hash}-{cache_hash}{__CACHE_FILE_EXTENSION}")
+
+
+def _write_cache(cache_path: str, config: Dict) -> None:
+    # Write to a temporary file first so concurrent loaders never read a partially written cache.
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path), suffix=".tmp", delete=False) as cache_file:
+        temporary_path = cache_file.name
+    try:
+        with open(temporary_path, "wb") as cache_file:
+            marshal.dump(config, cache_file)
+        os.replace(temporary_path, cache_path)
+    except (OSError, ValueError):
+        os.remove(temporary_path)
+        raise
+
+    # Caches of previous versions of the file are never read again, so don't let them pile up.
+    cache_prefix = cache_path.rsplit("-", 1)[0]
+    for stale_path in glob.glob(f"{cache_prefix}-*{__CACHE_FILE_EXTENSION}"):
+        if stale_path == cache_path:
+            continue
+        try:
+            os.remove(stale_path)
+        except OSError:
+            # Already pruned by a concurrent loader.
+            continue
+
+
+def load_configuration_file(file_path: str, logger: logging.Logger = logging.getLogger(__name__)) -> Dict:
+    """
+    Load the given yaml configuration file. The parsed content is cached on disk, keyed by the path, modification time
+    and size of the file, so following loads (process restarts, workers...) skip parsing until the file changes.
+    """
+    file_stat = os.stat(file_path)
+    cache_directory = _get_cache_directory(logger)
+    cache_path = _get_cache_path(cache_directory, file_path, file_stat) if cache_directory else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as cache_file:
+                return marshal.load(cache_file)
+        except (OSError, EOFError, ValueError, TypeError) as ex:
+            logger.warning(f"Failed to read configuration cache {cache_path}: {ex}")
+
+    with open(file_path, encoding="utf-8") as yaml_file:
+        # Empty yaml returns as None, so make sure to return as at least an empty dictionary.
+        config = yaml.load(yaml_file, Loader=YAML_LOADER) or {}
+
+    if cache_path:
+        try:
+            _write_cache(cache_path, config)
+        except (OSError, ValueError) as ex:
+            # ValueError is raised for values marshal can't handle (i.e. timestamps), those files are just not cached.
+            logger.warning(f"Failed to write configuration cache {cache_path}: {ex}")
+
+    return config
 
 
 class WebserviceConfiguration:
@@ -51,18 +186,16 @@ class WebserviceConfiguration:
             logger.warning(f"Configuration file {environment_configuration_file} doesn't exist.")
             return {}
 
-        with open(environment_configuration_file) as yaml_file:
-            # Empty yaml returns as None, so make sure to return as at least an empty dictionary.
-            config_from_yaml = yaml.load(yaml_file, Loader=yaml.FullLoader)
-            logger.info(f"Loaded configuration file {environment_configuration_file}.")
-            return config_from_yaml or {}
+        config_from_yaml = load_configuration_file(environment_configuration_file, logger)
+        logger.info(f"Loaded configuration file {environment_configuration_file}.")
+        return config_from_yaml
 
     @property
     def debug(self) -> bool:
         """
         Whether we are trying to debug the application or not.
         """
-        return self.config.get("debug", False)
+        return self.settings.debug
 
     @property
     def version(self) -> str:
@@ -85,6 +218,13 @@ class WebserviceConfiguration:
         """
         return self.__config
 
+    @property
+    def settings(self) -> WebserviceSettings:
+        """
+        The validated settings of the complex configuration.
+        """
+        return self.__settings
+
     @version.setter
     def version(self, value: str) -> None:
         if not isinstance(value, str):
@@ -104,6 +244,7 @@ class WebserviceConfiguration:
         if not isinstance(value, dict):
             raise TypeError("Invalid type given for config. Must be of type dict.")
 
+        self.__settings = parse_settings(value)
         self.__config = value
 
     @staticmethod
@@ -139,3 +280,13 @@ def get_configuration() -> WebserviceConfiguration:
         __CONFIGURATION = WebserviceConfiguration()
 
     return __CONFIGURATION
+
+
+def reload_configuration() -> WebserviceConfiguration:
+    """
+    Reload the global configuration from the environment, i.e. after the configuration file changed.
+    """
+    global __CONFIGURATION
+    __CONFIGURATION = WebserviceConfiguration()
+
+    return __CONFIGURATION
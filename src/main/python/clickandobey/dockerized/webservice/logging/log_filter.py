@@ -0,0 +1,159 @@
+"""
+Module used for filtering high volume log records.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, List, Optional, Tuple
+
+# Attribute set on the summary records emitted by the filter, so they are never throttled themselves.
+SUMMARY_ATTRIBUTE = "rate_limit_summary"
+# Attribute set on records whose volume is already limited by the caller (i.e. sampled errors), so they are never
+# throttled either. Those usually share a generic template, and throttling them would drop the first occurrences of
+# unrelated errors.
+SAMPLED_ATTRIBUTE = "rate_limit_sampled"
+
+
+class RateLimitingFilter(logging.Filter):
+    """
+    Filter throttling repeated log records using a token bucket per message template and level. The first occurrences
+    of a record always go through (up to the burst size), and the amount of suppressed records is periodically logged as
+    a summary and handed to the `on_suppressed` callback (i.e. to publish it as a metric). Summaries are emitted by a
+    background thread started on the first suppressed record of each process, so they don't wait for the next record.
+    """
+
+    def __init__(self,
+                 rate: float = 1.0,
+                 burst: int = 10,
+                 summary_interval_seconds: float = 60.0,
+                 max_keys: int = 1024,
+                 on_suppressed: Optional[Callable[[str, int, int], None]] = None,
+                 clock: Callable[[], float] = monotonic):
+        """
+        :param rate: The amount of records per second allowed for each template and level once the burst is spent.
+        :param burst: The amount of records allowed at once for each template and level.
+        :param summary_interval_seconds: The minimum amount of seconds between two summaries.
+        :param max_keys: The maximum amount of templates and levels tracked, least recently seen ones are dropped first.
+        :param on_suppressed: Called with the template, level and amount of suppressed records when summarizing.
+        :param clock: The clock used to refill the buckets, in seconds.
+        """
+        super().__init__()
+        self.__rate = rate
+        self.__burst = burst
+        self.__summary_interval_seconds = summary_interval_seconds
+        self.__max_keys = max_keys
+        self.__on_suppressed = on_suppressed
+        self.__clock = clock
+        self.__total_suppressed = 0
+        self.reset()
+
+    @property
+    def total_suppressed(self) -> int:
+        """
+        The amount of records suppressed since the filter was created.
+        """
+        return self.__total_suppressed
+
+    def reset(self) -> None:
+        """
+        Drop every bucket and pending summary, i.e. after forking as the lock may have been held by another thread.
+        """
+        self.__lock = threading.Lock()
+        self.__logger_name = __name__
+        # Any running summary thread exits once this no longer matches its process.
+        self.__summary_pid: Optional[int] = None
+        # (template, level) -> [tokens, last refill time, suppressed since the last summary]
+        self.__buckets: OrderedDict = OrderedDict()
+        self.__last_summary_time = self.__clock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, SUMMARY_ATTRIBUTE, False) or getattr(record, SAMPLED_ATTRIBUTE, False):
+            return True
+
+        key = (str(record.msg), record.levelno)
+        with self.__lock:
+            self.__logger_name = record.name
+            now = self.__clock()
+            bucket = self.__buckets.get(key)
+            if bucket is None:
+                bucket = [float(self.__burst), now, 0]
+                self.__buckets[key] = bucket
+                if len(self.__buckets) > self.__max_keys:
+                    self.__buckets.popitem(last=False)
+            else:
+                self.__buckets.move_to_end(key)
+                bucket[0] = min(float(self.__burst), bucket[0] + (now - bucket[1]) * self.__rate)
+                bucket[1] = now
+
+            allowed = bucket[0] >= 1
+            if allowed:
+                bucket[0] -= 1
+            else:
+                bucket[2] += 1
+                self.__total_suppressed += 1
+                if self.__summary_pid != os.getpid():
+                    self.__start_summary_thread()
+
+            summaries = self.__collect_summaries(now)
+
+        if summaries:
+            self.__summarize(record.name, summaries)
+        return allowed
+
+    def flush(self, force: bool = True) -> None:
+        """
+        Summarize the suppressed records, right away if forced (i.e. before exiting) or once the interval passed.
+        """
+        with self.__lock:
+            summaries = self.__collect_summaries(self.__clock(), force=force)
+            logger_name = self.__logger_name
+
+        if summaries:
+            self.__summarize(logger_name, summaries)
+
+    def __start_summary_thread(self) -> None:
+        self.__summary_pid = os.getpid()
+        threading.Thread(target=self.__summarize_periodically, name="log-summary", daemon=True).start()
+
+    def __summarize_periodically(self) -> None:
+        pid = os.getpid()
+        while self.__summary_pid == pid:
+            # Looked up on every call rather than imported, so gevent workers patching the module after it was imported
+            # (i.e. preloaded by the master) get a cooperative sleep instead of one blocking the whole worker.
+            time.sleep(self.__summary_interval_seconds)
+            self.flush(force=False)
+
+    def __collect_summaries(self, now: float, force: bool = False) -> List[Tuple[str, int, int]]:
+        if not force and now - self.__last_summary_time < self.__summary_interval_seconds:
+            return []
+
+        self.__last_summary_time = now
+        summaries = []
+        for (template, level), bucket in self.__buckets.items():
+            if bucket[2]:
+                summaries.append((template, level, bucket[2]))
+                bucket[2] = 0
+        return summaries
+
+    def __summarize(self, logger_name: str, summaries: List[Tuple[str, int, int]]) -> None:
+        logger = logging.getLogger(logger_name)
+        for template, level, suppressed in summaries:
+            logger.log(
+                level,
+                "Suppressed %i log records like '%s' since the last summary.",
+                suppressed,
+                template,
+                extra={SUMMARY_ATTRIBUTE: True},
+            )
+            if self.__on_suppressed is None:
+                continue
+            try:
+                self.__on_suppressed(template, level, suppressed)
+            except Exception as ex:
+                # Filters must never raise, so just report the failure.
+                logger.warning("Failed to report suppressed log records: %s", str(ex), extra={SUMMARY_ATTRIBUTE: True})
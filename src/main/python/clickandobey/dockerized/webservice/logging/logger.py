@@ -4,15 +4,20 @@ Module used for handling logging utilities.
 
 import logging
 
+from typing import Optional
 
-def create_logger(verbose: bool) -> logging.Logger:
+
+def create_logger(verbose: bool, log_filter: Optional[logging.Filter] = None) -> logging.Logger:
     """
     Create a stream logger.
     :param verbose: Whether to output debug information.
+    :param log_filter: Optional filter applied to every record of the logger, i.e. to rate limit it.
     """
     logger = logging.getLogger(__name__)
     logging_level = logging.DEBUG if verbose else logging.INFO
     logger.setLevel(logging_level)
+    if log_filter is not None:
+        logger.addFilter(log_filter)
 
     stream_handler = logging.StreamHandler()
     stream_handler.setLevel(logging_level)
@@ -0,0 +1,339 @@
+"""
+Module used to record the history of the metrics in a fixed size ring file per process, and to read it back.
+
+Every metric is aggregated per second and per minute (count, sum, min, max and a log scale histogram used to estimate
+percentiles). Complete aggregates are written as fixed size records directly into a memory mapped file, so the file
+never grows and the history of every worker survives them for post-mortem analysis.
+"""
+
+import glob
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+RESOLUTIONS_SECONDS = (1, 60)
+
+COUNT_KIND = 0
+TIMER_KIND = 1
+ERROR_KIND = 2
+KIND_NAMES = {COUNT_KIND: "count", TIMER_KIND: "timer", ERROR_KIND: "error"}
+
+HISTOGRAM_BUCKETS = 48
+# Buckets grow by a factor of sqrt(2) from this value, covering 0.1 to ~1,000,000 (milliseconds for timers).
+HISTOGRAM_BASE = 0.1
+MAX_NAME_BYTES = 96
+
+_MAGIC = b"WSMHIST1"
+# Magic, capacity, write index.
+_HEADER = struct.Struct("<8sQQ")
+# Sequence (0 while being written), bucket start in epoch seconds, resolution, kind, name, count, sum, min, max,
+# histogram.
+_RECORD = struct.Struct(f"<QqIB{MAX_NAME_BYTES}sQddd{HISTOGRAM_BUCKETS}I")
+# Leading fields of a record, enough to decide whether the rest of it needs to be unpacked.
+_RECORD_KEY = struct.Struct(f"<QqIB{MAX_NAME_BYTES}s")
+_RING_FILE_PATTERN = "metrics-*.ring"
+_RETENTION_SECONDS = 24 * 60 * 60
+# Aggregates are written once complete, at most a flush interval (plus scheduling delays) after the end of their bucket,
+# and file modification times lag behind writes to memory mapped pages. Readers allow for both with this margin.
+_READ_MARGIN_SECONDS = 120
+
+
+def _get_bucket(value: float) -> int:
+    if value <= HISTOGRAM_BASE:
+        return 0
+    return min(HISTOGRAM_BUCKETS - 1, math.ceil(2 * math.log2(value / HISTOGRAM_BASE)))
+
+
+def _get_bucket_upper_bound(bucket: int) -> float:
+    return HISTOGRAM_BASE * 2 ** (bucket / 2)
+
+
+class Aggregate:
+    """
+    Aggregate of the values of a metric over a period of time. Aggregates of the same metric can be merged.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, value: float) -> None:
+        """
+        Add a value to the aggregate.
+        """
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.histogram[_get_bucket(value)] += 1
+
+    def merge(self, other: "Aggregate") -> None:
+        """
+        Merge another aggregate of the same metric in this one.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram = [mine + theirs for mine, theirs in zip(self.histogram, other.histogram)]
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """
+        Estimate the given percentile (between 0 and 100) of the values, within the precision of the histogram.
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        cumulative = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(max(_get_bucket_upper_bound(bucket), self.minimum), self.maximum)
+        return self.maximum
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """
+        Return the aggregate as a dictionary.
+        """
+        return {
+            "Count": self.count,
+            "Sum": self.total,
+            "Min": self.minimum if self.count else None,
+            "Max": self.maximum if self.count else None,
+            "P50": self.percentile(50),
+            "P90": self.percentile(90),
+            "P99": self.percentile(99),
+        }
+
+
+class MetricsHistory:
+    """
+    Class used to record the history of the metrics of this process in a ring file. The file is opened on the first
+    record of each process, so a history created before forking is never shared by the workers.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 capacity: int = 32768,
+                 flush_interval_seconds: float = 1.0,
+                 logger: logging.Logger = logging.getLogger(__name__)):
+        """
+        :param directory: The directory the ring files are written to.
+        :param capacity: The amount of records kept per ring file.
+        :param flush_interval_seconds: How often complete aggregates are written by the background thread.
+        :param logger: The logger used to report failures.
+        """
+        self.__directory = directory
+        self.__capacity = capacity
+        self.__flush_interval_seconds = flush_interval_seconds
+        self.__logger = logger
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop the state of the history without writing it, i.e. in a forked worker inheriting the state of its parent.
+        """
+        self.__lock = threading.Lock()
+        self.__pid: Optional[int] = None
+        self.__mmap: Optional[mmap.mmap] = None
+        self.__write_index = 0
+        self.__flush_thread: Optional[threading.Thread] = None
+        # resolution -> (metric name, kind) -> (bucket start, aggregate)
+        self.__aggregates: Dict[int, Dict[Tuple[str, int], Tuple[int, Aggregate]]] = {
+            resolution: {} for resolution in RESOLUTIONS_SECONDS
+        }
+
+    def record(self, name: str, kind: int, value: float) -> None:
+        """
+        Record a value for the given metric.
+        """
+        now = time.time()
+        with self.__lock:
+            if self.__pid != os.getpid():
+                self.__open()
+            for resolution, aggregates in self.__aggregates.items():
+                bucket_start = int(now) // resolution * resolution
+                current = aggregates.get((name, kind))
+                if current is None or current[0] != bucket_start:
+                    if current is not None:
+                        self.__write(name, kind, resolution, *current)
+                    current = (bucket_start, Aggregate())
+                    aggregates[(name, kind)] = current
+                current[1].add(value)
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Write the complete aggregates, or every aggregate if forced (i.e. before exiting).
+        """
+        now = time.time()
+        with self.__lock:
+            for resolution, aggregates in self.__aggregates.items():
+                for (name, kind), (bucket_start, aggregate) in list(aggregates.items()):
+                    if force or bucket_start + resolution <= now:
+                        self.__write(name, kind, resolution, bucket_start, aggregate)
+                        del aggregates[(name, kind)]
+            if force and self.__mmap is not None:
+                self.__mmap.flush()
+
+    def __open(self) -> None:
+        self.__pid = os.getpid()
+        self.__mmap = None
+        try:
+            os.makedirs(self.__directory, exist_ok=True)
+            self.__prune()
+            file_path = os.path.join(self.__directory, f"metrics-{self.__pid}.ring")
+            size = _HEADER.size + self.__capacity * _RECORD.size
+            with open(file_path, "w+b") as ring_file:
+                ring_file.truncate(size)
+                self.__mmap = mmap.mmap(ring_file.fileno(), size)
+            _HEADER.pack_into(self.__mmap, 0, _MAGIC, self.__capacity, 0)
+            self.__write_index = 0
+        except OSError as ex:
+            self.__logger.warning("Failed to open metrics history in %s: %s", self.__directory, str(ex))
+            return
+
+        self.__flush_thread = threading.Thread(target=self.__flush_periodically, name="metrics-history", daemon=True)
+        self.__flush_thread.start()
+
+    def __prune(self) -> None:
+        for file_path in glob.glob(os.path.join(self.__directory, _RING_FILE_PATTERN)):
+            try:
+                if os.path.getmtime(file_path) < time.time() - _RETENTION_SECONDS:
+                    os.remove(file_path)
+            except OSError:
+                continue
+
+    def __flush_periodically(self) -> None:
+        pid = os.getpid()
+        while self.__pid == pid:
+            time.sleep(self.__flush_interval_seconds)
+            try:
+                self.flush()
+            except Exception as ex:
+                self.__logger.warning("Failed to flush metrics history: %s", str(ex))
+
+    def __write(self, name: str, kind: int, resolution: int, bucket_start: int, aggregate: Aggregate) -> None:
+        if self.__mmap is None:
+            return
+
+        offset = _HEADER.size + (self.__write_index % self.__capacity) * _RECORD.size
+        self.__write_index += 1
+        # Readers skip records whose sequence is 0 or changed while they read them, so mark the record as being written
+        # first and only publish its sequence once it is complete.
+        struct.pack_into("<Q", self.__mmap, offset, 0)
+        _RECORD.pack_into(
+            self.__mmap,
+            offset,
+            0,
+            bucket_start,
+            resolution,
+            kind,
+            name.encode("utf-8")[:MAX_NAME_BYTES],
+            aggregate.count,
+            aggregate.total,
+            aggregate.minimum,
+            aggregate.maximum,
+            *aggregate.histogram,
+        )
+        struct.pack_into("<Q", self.__mmap, offset, self.__write_index)
+        _HEADER.pack_into(self.__mmap, 0, _MAGIC, self.__capacity, self.__write_index)
+
+
+def _read_ring_file(file_path: str,
+                    name: bytes,
+                    resolution: int,
+                    start: int,
+                    end: int) -> List[Tuple[int, int, Aggregate]]:
+    with open(file_path, "rb") as ring_file:
+        with mmap.mmap(ring_file.fileno(), 0, access=mmap.ACCESS_READ) as ring:
+            if len(ring) < _HEADER.size:
+                return []
+            magic, capacity, write_index = _HEADER.unpack_from(ring, 0)
+            if magic != _MAGIC or len(ring) < _HEADER.size + capacity * _RECORD.size:
+                return []
+            return _read_records(ring, capacity, write_index, name, resolution, (start, end))
+
+
+def _read_records(ring: mmap.mmap,
+                  capacity: int,
+                  write_index: int,
+                  name: bytes,
+                  resolution: int,
+                  window: Tuple[int, int]) -> List[Tuple[int, int, Aggregate]]:
+    # Records are written in the order their buckets complete, so walk them from the most recent one and stop once they
+    # started too long before the window to be followed by any record within it.
+    records = []
+    oldest_start = window[0] - max(RESOLUTIONS_SECONDS) - _READ_MARGIN_SECONDS
+    for index in range(write_index - 1, max(0, write_index - capacity) - 1, -1):
+        offset = _HEADER.size + (index % capacity) * _RECORD.size
+        sequence, bucket_start, record_resolution, _, record_name = _RECORD_KEY.unpack_from(ring, offset)
+        # Records being written, or already overwritten by a more recent one, don't have the expected sequence.
+        if sequence != index + 1:
+            continue
+        if bucket_start < oldest_start:
+            break
+        if (record_resolution != resolution or not window[0] <= bucket_start < window[1]
+                or record_name.rstrip(b"\0") != name):
+            continue
+
+        values = _RECORD.unpack_from(ring, offset)
+        if struct.unpack_from("<Q", ring, offset)[0] != sequence:
+            continue
+        records.append((bucket_start, values[3], _unpack_aggregate(values)))
+    return records
+
+
+def _unpack_aggregate(values: Tuple) -> Aggregate:
+    aggregate = Aggregate()
+    aggregate.count, aggregate.total, aggregate.minimum, aggregate.maximum = values[5:9]
+    aggregate.histogram = list(values[9:])
+    return aggregate
+
+
+def read_history(directory: str,
+                 name: str,
+                 window_seconds: int = 300,
+                 resolution: int = 1,
+                 now: Optional[float] = None) -> List[Dict]:
+    """
+    Read the history of the given metric over the last window, merged across every ring file of the directory.
+    :return: The aggregated points of the metric, ordered by time.
+    """
+    if resolution not in RESOLUTIONS_SECONDS:
+        raise ValueError(f"Invalid resolution {resolution}. Must be one of {RESOLUTIONS_SECONDS}.")
+
+    end = int(now if now is not None else time.time())
+    start = end - window_seconds
+    encoded_name = name.encode("utf-8")[:MAX_NAME_BYTES]
+    points: Dict[Tuple[int, int], Aggregate] = {}
+    for file_path in glob.glob(os.path.join(directory, _RING_FILE_PATTERN)):
+        try:
+            # Files of workers gone since before the window (kept for post-mortem analysis) have nothing to add.
+            if os.path.getmtime(file_path) < start - max(RESOLUTIONS_SECONDS) - _READ_MARGIN_SECONDS:
+                continue
+            records = _read_ring_file(file_path, encoded_name, resolution, start, end)
+        except (OSError, ValueError):
+            # The file may be removed or truncated while being read, its history is simply skipped.
+            continue
+        for bucket_start, kind, aggregate in records:
+            if (bucket_start, kind) in points:
+                points[(bucket_start, kind)].merge(aggregate)
+            else:
+                points[(bucket_start, kind)] = aggregate
+
+    return [
+        {"Timestamp": bucket_start, "Kind": KIND_NAMES.get(kind, "unknown"), **aggregate.to_dict()}
+        for (bucket_start, kind), aggregate in sorted(points.items())
+    ]
@@ -6,14 +6,26 @@ import logging
 
 from typing import Optional
 
+from clickandobey.dockerized.webservice.metrics.history import COUNT_KIND, ERROR_KIND, TIMER_KIND, MetricsHistory
+
 
 class Metrics:
     """
     Class used to handle metrics.
     """
 
-    def __init__(self, logger: logging.Logger = logging.getLogger(__name__)):
+    def __init__(self,
+                 logger: logging.Logger = logging.getLogger(__name__),
+                 history: Optional[MetricsHistory] = None):
         self.__logger = logger
+        self.__history = history
+        self.__notified_kinds = set()
+
+    def __notify_unimplemented(self, kind: str) -> None:
+        # Only remind once per kind, so a burst of metrics (i.e. an error storm) doesn't turn into a burst of logs.
+        if kind not in self.__notified_kinds:
+            self.__notified_kinds.add(kind)
+            self.__logger.info("Implement your metrics management for %s.", kind)
 
     def publish_elapsed_time(self, metric: str, millis: int, description: Optional[str] = None) -> None:
         """
@@ -21,7 +33,9 @@ class Metrics:
         """
         try:
             self.__logger.debug("%s timing of %i milliseconds (%s)", metric, millis, description)
-            self.__logger.info("Implement your metrics management for timing.")
+            self.__notify_unimplemented("timing")
+            if self.__history is not None:
+                self.__history.record(metric, TIMER_KIND, millis)
         except Exception as ex:
             self.__logger.exception("Failed to publish elapsed stat: %s", str(ex))
 
@@ -31,7 +45,9 @@ class Metrics:
         """
         try:
             self.__logger.debug("%s count of %i (%s)", metric, value, description)
-            self.__logger.info("Implement your metrics management for counts.")
+            self.__notify_unimplemented("counts")
+            if self.__history is not None:
+                self.__history.record(metric, COUNT_KIND, value)
         except Exception as ex:
             self.__logger.exception("Failed to publish counter metric: %s", str(ex))
 
@@ -41,6 +57,8 @@ class Metrics:
         """
         try:
             self.__logger.debug("%s error (%s)", metric, description)
-            self.__logger.info("Implement your metrics management for errors.")
+            self.__notify_unimplemented("errors")
+            if self.__history is not None:
+                self.__history.record(metric, ERROR_KIND, 1)
         except Exception as ex:
             self.__logger.exception("Failed to publish error metric: %s", str(ex))
@@ -7,22 +7,37 @@ import logging
 from time import perf_counter
 from typing import Optional, Union
 
+from clickandobey.dockerized.webservice.metrics.history import MetricsHistory
 from clickandobey.dockerized.webservice.metrics.metrics import Metrics
 
 
 __METRICS_COLLECTOR: Optional[Metrics] = None
 
 
-def initialize_metrics_collector(logger: logging.Logger = logging.getLogger(__name__)) -> None:
+def initialize_metrics_collector(logger: logging.Logger = logging.getLogger(__name__),
+                                 history: Optional[MetricsHistory] = None) -> None:
     """
     Initialize the metrics collector.
+    :param logger: The logger used by the metrics collector.
+    :param history: Optional history every metric is also recorded to.
     """
     global __METRICS_COLLECTOR
 
     if __METRICS_COLLECTOR is not None:
         raise AssertionError("Metrics Collector has already been initialized.")
 
-    __METRICS_COLLECTOR = Metrics(logger)
+    __METRICS_COLLECTOR = Metrics(logger, history)
+
+
+def reinitialize_metrics_collector(logger: logging.Logger = logging.getLogger(__name__),
+                                   history: Optional[MetricsHistory] = None) -> None:
+    """
+    Replace the metrics collector with a new one, i.e. in a forked worker that must not share the one of its parent.
+    """
+    global __METRICS_COLLECTOR
+
+    __METRICS_COLLECTOR = None
+    initialize_metrics_collector(logger, history)
 
 
 def _get_metrics_collector() -> Metrics:
@@ -0,0 +1,169 @@
+"""
+Gunicorn configuration used to run the webservice, i.e. `gunicorn --config python:<this module> <app>`.
+
+By default the app is preloaded: it is built once in the master process (configuration, logger, Swagger specs...) and
+the heap is frozen before forking, so workers share those pages copy-on-write and only re-initialize fork-unsafe state.
+With gevent workers, the master is monkey patched before preloading the app, since modules bind blocking functions at
+import time (i.e. `from time import sleep`) and workers patching themselves after forking can't replace those.
+Fork-unsafe state is re-initialized once the worker is initialized rather than right after forking, so the new locks
+and threads are patched ones.
+
+Whether to patch the master is decided from the environment (`WORKER_CLASS` and `PRELOAD_APP`), before gunicorn applies
+its command line. The hooks rely on the final configuration of the server, and the master refuses to start when the
+command line asks for a preloaded app with gevent workers it didn't patch for.
+
+Workers are drained on SIGTERM (and SIGHUP): they are marked as not ready, stop accepting new requests, wait for the
+in-flight ones up to the graceful timeout, then flush their metrics and logs before exiting. Sending SIGHUP to the
+master replaces every worker this way, the new ones being warmed up before they are marked as ready. With a preloaded
+app, only the settings read while handling requests are reloaded along the way (see `on_reload`).
+"""
+
+import os
+import random
+import signal
+import sys
+import threading
+
+from time import monotonic
+
+bind = f"0.0.0.0:{os.getenv('PORT', '9001')}"
+workers = int(os.getenv("WORKERS", "1"))
+worker_class = os.getenv("WORKER_CLASS", "gevent")
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+# Seconds between a worker being marked as not ready and it closing its listening socket, giving load balancers
+# polling the status endpoint time to stop sending it requests.
+drain_delay_seconds = float(os.getenv("DRAIN_DELAY_SECONDS", "0"))
+
+
+def _uses_gevent(worker_class_name: str) -> bool:
+    return "gevent" in worker_class_name.lower()
+
+
+# Only patch when loaded by gunicorn, never when imported elsewhere (i.e. by the tests).
+if preload_app and _uses_gevent(worker_class) and "gunicorn.arbiter" in sys.modules:
+    from gevent import monkey
+    monkey.patch_all()
+
+# pylint: disable=wrong-import-position
+from clickandobey.dockerized.webservice.server.lifecycle import (
+    freeze_heap,
+    get_memory_usage,
+    mark_draining,
+    mark_ready,
+    run_post_fork,
+    run_shutdown,
+    wait_for_in_flight_requests,
+)
+
+__DRAIN_SIGNALS = (signal.SIGTERM, signal.SIGHUP)
+
+
+def when_ready(server) -> None:
+    """
+    Warm up the preloaded app in the master before any worker gets forked.
+    :raises RuntimeError: If the app was preloaded for gevent workers by a master that wasn't patched.
+    """
+    if not server.cfg.preload_app:
+        return
+
+    if _uses_gevent(server.cfg.worker_class_str) and not __is_patched():
+        raise RuntimeError(
+            "Invalid gunicorn configuration. Preloading the app for gevent workers requires WORKER_CLASS and "
+            "PRELOAD_APP to be set in the environment, so the master is patched before loading it."
+        )
+
+    # pylint: disable=import-outside-toplevel
+    from clickandobey.dockerized.webservice.api.app import warm_up
+    warm_up(server.app.wsgi(), server.log)
+
+
+def on_reload(server) -> None:
+    """
+    Reload the configuration of the master, so the replacement workers forked from a preloaded app pick it up.
+
+    The preloaded app itself is not rebuilt, so only the settings read while handling requests (i.e. the batch limits,
+    or /admin/configuration) are reloaded. The ones read when building the app (log level, metrics history, version of
+    the APIs...) require restarting the master, or upgrading it with SIGUSR2.
+    """
+    if not server.cfg.preload_app:
+        return
+
+    # pylint: disable=import-outside-toplevel
+    from clickandobey.dockerized.webservice.configuration.webservice_configuration import reload_configuration
+    reload_configuration()
+    server.log.info("Configuration reloaded.")
+
+
+def pre_fork(server, worker) -> None:
+    """
+    Freeze the heap of the master so the garbage collector of the worker leaves the shared pages alone.
+    """
+    # pylint: disable=unused-argument
+    if server.cfg.preload_app:
+        freeze_heap()
+
+
+def post_worker_init(worker) -> None:
+    """
+    Re-initialize the fork-unsafe state inherited from the master, warm up the worker, install the drain signal handlers
+    and mark the worker as ready.
+    """
+    random.seed()
+    run_post_fork(worker.log)
+
+    if not worker.cfg.preload_app:
+        # pylint: disable=import-outside-toplevel
+        from clickandobey.dockerized.webservice.api.app import warm_up
+        warm_up(worker.wsgi, worker.log)
+
+    __install_drain_handlers(worker)
+    mark_ready()
+
+    memory_usage = get_memory_usage()
+    if memory_usage:
+        worker.log.info(
+            "Worker %s ready, memory: %i kB shared, %i kB private.",
+            worker.pid,
+            memory_usage["Shared"],
+            memory_usage["Private"],
+        )
+
+
+def worker_exit(server, worker) -> None:
+    """
+    Wait for the in-flight requests of the exiting worker, for whatever is left of its graceful timeout, then flush its
+    buffered metrics and logs.
+    """
+    # pylint: disable=unused-argument
+    mark_draining()
+    # Gunicorn already waited for the requests when stopping the worker, and the master kills workers past their
+    # graceful timeout, so never wait beyond the deadline set when the drain started.
+    remaining_seconds = max(0.0, getattr(worker, "drain_deadline", 0.0) - monotonic())
+    if not wait_for_in_flight_requests(remaining_seconds):
+        worker.log.warning("Worker %s exiting with requests still in flight.", worker.pid)
+    run_shutdown(worker.log)
+
+
+def __install_drain_handlers(worker) -> None:
+    def handle_drain(signum, frame) -> None:
+        # The master keeps signaling the workers it replaces until they exit, only the first signal starts the drain.
+        if getattr(worker, "drain_deadline", None) is not None:
+            return
+
+        mark_draining()
+        worker.drain_deadline = monotonic() + worker.cfg.graceful_timeout
+        worker.log.info("Worker %s draining on signal %s.", worker.pid, signum)
+        # Gunicorn's exit handler stops accepting new requests, and waits for the in-flight ones before exiting.
+        if drain_delay_seconds > 0:
+            threading.Timer(drain_delay_seconds, worker.handle_exit, (signum, frame)).start()
+        else:
+            worker.handle_exit(signum, frame)
+
+    for drain_signal in __DRAIN_SIGNALS:
+        signal.signal(drain_signal, handle_drain)
+
+
+def __is_patched() -> bool:
+    monkey_module = sys.modules.get("gevent.monkey")
+    return monkey_module is not None and monkey_module.is_module_patched("time")
@@ -0,0 +1,174 @@
+"""
+Module used to manage the lifecycle of the webservice processes when run by a pre-forking server.
+"""
+
+import gc
+import logging
+import threading
+
+from time import monotonic
+from typing import Callable, Dict, List, Union
+
+__POST_FORK_CALLBACKS: List[Callable[[], None]] = []
+__SHUTDOWN_CALLBACKS: List[Callable[[], None]] = []
+
+# Readiness and in-flight requests of this process, guarded by the condition.
+__REQUESTS_CONDITION = threading.Condition()
+__READY = False
+__IN_FLIGHT_REQUESTS = 0
+
+# Fields of /proc/<pid>/smaps_rollup, in kB, summed up for the memory usage report.
+__SHARED_MEMORY_FIELDS = ("Shared_Clean", "Shared_Dirty")
+__PRIVATE_MEMORY_FIELDS = ("Private_Clean", "Private_Dirty")
+
+
+def register_post_fork(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback re-initializing fork-unsafe state (threads, locks, file handles...) in forked workers. Can be
+    used as a decorator.
+    """
+    __POST_FORK_CALLBACKS.append(callback)
+    return callback
+
+
+def run_post_fork(logger: logging.Logger = logging.getLogger(__name__)) -> None:
+    """
+    Run every registered post fork callback, in registration order. Meant to be called in the worker after forking.
+    """
+    for callback in __POST_FORK_CALLBACKS:
+        try:
+            callback()
+        except Exception as ex:
+            logger.exception("Failed to run post fork callback %s: %s", callback, str(ex))
+
+
+def register_shutdown(callback: Callable[[], None]) -> Callable[[], None]:
+    """
+    Register a callback flushing buffered state (metrics, logs...) before the process exits. Can be used as a decorator.
+    """
+    __SHUTDOWN_CALLBACKS.append(callback)
+    return callback
+
+
+def run_shutdown(logger: logging.Logger = logging.getLogger(__name__)) -> None:
+    """
+    Run every registered shutdown callback, in registration order. Meant to be called once requests are drained.
+    """
+    for callback in __SHUTDOWN_CALLBACKS:
+        try:
+            callback()
+        except Exception as ex:
+            logger.exception("Failed to run shutdown callback %s: %s", callback, str(ex))
+
+
+def is_ready() -> bool:
+    """
+    Whether this process is warmed up and accepting new requests.
+    """
+    return __READY
+
+
+def mark_ready() -> None:
+    """
+    Mark this process as ready to accept new requests, once it is warmed up.
+    """
+    global __READY
+
+    __READY = True
+
+
+def mark_draining() -> None:
+    """
+    Mark this process as no longer accepting new requests, i.e. when it is asked to exit.
+    """
+    global __READY
+
+    __READY = False
+
+
+def request_started() -> None:
+    """
+    Track a request starting to be handled by this process.
+    """
+    global __IN_FLIGHT_REQUESTS
+
+    with __REQUESTS_CONDITION:
+        __IN_FLIGHT_REQUESTS += 1
+
+
+def request_finished() -> None:
+    """
+    Track a request done being handled by this process.
+    """
+    global __IN_FLIGHT_REQUESTS
+
+    with __REQUESTS_CONDITION:
+        __IN_FLIGHT_REQUESTS -= 1
+        if __IN_FLIGHT_REQUESTS <= 0:
+            __REQUESTS_CONDITION.notify_all()
+
+
+def get_in_flight_requests() -> int:
+    """
+    Return the amount of requests currently being handled by this process.
+    """
+    return __IN_FLIGHT_REQUESTS
+
+
+def wait_for_in_flight_requests(timeout_seconds: float) -> bool:
+    """
+    Wait for the requests being handled by this process to finish.
+    :return: Whether every request finished before the timeout.
+    """
+    deadline = monotonic() + timeout_seconds
+    with __REQUESTS_CONDITION:
+        while __IN_FLIGHT_REQUESTS > 0:
+            remaining_seconds = deadline - monotonic()
+            if remaining_seconds <= 0:
+                return False
+            __REQUESTS_CONDITION.wait(remaining_seconds)
+    return True
+
+
+@register_post_fork
+def _reset_requests_state() -> None:
+    # Forked workers start cold, with nothing in flight, and their own condition in case another thread held it.
+    global __REQUESTS_CONDITION, __READY, __IN_FLIGHT_REQUESTS
+
+    __REQUESTS_CONDITION = threading.Condition()
+    __READY = False
+    __IN_FLIGHT_REQUESTS = 0
+
+
+def freeze_heap() -> None:
+    """
+    Move every object currently tracked by the garbage collector to its permanent generation. Meant to be called right
+    before forking, so collections in the workers don't write to (and therefore copy) the pages shared with the master.
+    """
+    gc.collect()
+    gc.freeze()
+
+
+def get_memory_usage(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    Return the shared and private memory of the given process in kB, or an empty dictionary if it can't be determined
+    (i.e. not running on linux).
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="utf-8") as smaps_file:
+            lines = smaps_file.readlines()
+    except OSError:
+        return {}
+
+    fields = {}
+    for line in lines:
+        parts = line.split()
+        if len(parts) == 3 and parts[2] == "kB":
+            fields[parts[0].rstrip(":")] = int(parts[1])
+
+    return {
+        "Rss": fields.get("Rss", 0),
+        "Pss": fields.get("Pss", 0),
+        "Shared": sum(fields.get(field, 0) for field in __SHARED_MEMORY_FIELDS),
+        "Private": sum(fields.get(field, 0) for field in __PRIVATE_MEMORY_FIELDS),
+    }
@@ -53,3 +53,20 @@ class TestAdminEndpoints:
 
         status = response.json()
         assert status["Running"], "Failed to get the correct status."
+        assert status["Ready"], "Failed to get the correct readiness."
+
+    def test_metrics(self, admin_host_url: str):
+        """
+        Test to ensure the metrics history endpoint comes back as expected.
+        """
+        requests.get(f"{admin_host_url}/hello").raise_for_status()
+        response = requests.get(f"{admin_host_url}/admin/metrics/Hello World Timer", params={"window": 60})
+        response.raise_for_status()
+        assert response.status_code == 200, "Failed to get the correct response code from the metrics request."
+
+        history = response.json()
+        assert history["Metric"] == "Hello World Timer", "Failed to get the history of the requested metric."
+        assert isinstance(history["Points"], list), "Failed to get the history points."
+
+        response = requests.get(f"{admin_host_url}/admin/metrics/Hello World Timer", params={"window": -1})
+        assert response.status_code == 400, "Failed to reject an invalid window."
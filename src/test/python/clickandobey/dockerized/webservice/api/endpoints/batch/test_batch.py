@@ -0,0 +1,82 @@
+"""
+Module used to test the limits of the batch endpoint.
+"""
+
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+from clickandobey.dockerized.webservice.api.app import API
+from clickandobey.dockerized.webservice.api.endpoints.batch import batch
+from clickandobey.dockerized.webservice.configuration.webservice_configuration import get_configuration
+
+
+@pytest.mark.unit
+@pytest.mark.BatchEndpoints
+class TestBatch:
+    """
+    Class used to test the batch endpoint through the test client.
+    """
+
+    @pytest.fixture()
+    def client(self):
+        """
+        Return a test client for the flask app, with a fresh pool for the batches.
+        """
+        batch._reset_executor()  # pylint: disable=protected-access
+        with API.test_client() as client:
+            yield client
+        batch._reset_executor()  # pylint: disable=protected-access
+
+    @staticmethod
+    def __set_settings(monkeypatch, **settings) -> None:
+        configuration = SimpleNamespace(settings=get_configuration().settings._replace(**settings))
+        monkeypatch.setattr(batch, "get_configuration", lambda: configuration)
+
+    def test_timeout(self, client, monkeypatch):
+        """
+        Test to ensure sub-requests time out, and running ones are reported as abandoned.
+        """
+        def slow_dispatch(flask_app, path, headers):
+            # pylint: disable=unused-argument
+            time.sleep(0.5)
+            return {"status": 200, "body": b"{}", "json": True}
+
+        counts = []
+        self.__set_settings(monkeypatch, batch_timeout_seconds=0.05, batch_pool_size=1)
+        monkeypatch.setattr(batch, "_dispatch", slow_dispatch)
+        monkeypatch.setattr(batch, "publish_count", lambda metric, description, value: counts.append((metric, value)))
+
+        response = client.post("/batch", json={"requests": [{"path": "/hello"}, {"path": "/hello"}]})
+        assert response.status_code == 200, "Failed to get the correct response code from the batch request."
+        assert [sub_response["status"] for sub_response in response.get_json()["responses"]] == [504, 504], \
+            "Failed to time out the sub-requests."
+        # The first request is running in the single slot of the pool, only the queued one can be cancelled.
+        assert ("Batch Abandoned Requests", 1) in counts, "Failed to report the abandoned request."
+
+    def test_response_size(self, client, monkeypatch):
+        """
+        Test to ensure sub-responses exceeding the size budget of the batch are replaced by an error.
+        """
+        self.__set_settings(monkeypatch, batch_max_response_bytes=30)
+
+        response = client.post("/batch", json={"requests": [{"path": "/hello"}, {"path": "/hello"}]})
+        responses = response.get_json()["responses"]
+        assert responses[0]["body"] == {"hello": "world"}, "Failed to return the sub-response within the budget."
+        assert responses[1]["status"] == 413, "Failed to reject the sub-response exceeding the budget."
+
+    def test_malformed_json(self, client, monkeypatch):
+        """
+        Test to ensure sub-responses claiming to be JSON without being so are returned as is.
+        """
+        monkeypatch.setattr(batch, "_dispatch", lambda flask_app, path, headers: {
+            "status": 200,
+            "body": b"{not json",
+            "json": True,
+        })
+
+        response = client.post("/batch", json={"requests": [{"path": "/hello"}]})
+        assert response.status_code == 200, "Failed to get the correct response code from the batch request."
+        assert response.get_json()["responses"][0]["body"] == "{not json", "Failed to return the raw body."
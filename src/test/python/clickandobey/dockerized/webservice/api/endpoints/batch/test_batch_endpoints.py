@@ -0,0 +1,63 @@
+"""
+Module used to test the batch endpoint for the api.
+"""
+
+import pytest
+import requests
+
+from clickandobey.dockerized.webservice.configuration.webservice_configuration import WebserviceConfiguration
+
+
+@pytest.mark.integration
+@pytest.mark.system
+@pytest.mark.BatchEndpoints
+class TestBatchEndpoints:
+    """
+    Class used to test the batch endpoint for the api.
+    """
+
+    @pytest.fixture()
+    def host_url(self) -> str:
+        """
+        Return the url for the api.
+        """
+        environment = WebserviceConfiguration().environment
+        if environment == "localhost":
+            yield "http://localhost:9001"
+            return
+        if environment == "docker":
+            yield "http://clickandobey-python-dockerized-webservice-app:9001"
+            return
+
+        raise ValueError(f"Unexpected environment value {environment}")
+
+    def test_batch(self, host_url: str):
+        """
+        Test to ensure the batch endpoint returns the responses of every sub-request, in order.
+        """
+        batch = {
+            "requests": [
+                {"path": "/hello"},
+                {"path": "/admin/status"},
+                {"path": "/does/not/exist"},
+            ]
+        }
+        response = requests.post(f"{host_url}/batch", json=batch)
+        response.raise_for_status()
+        assert response.status_code == 200, "Failed to get the correct response code from the batch request."
+
+        responses = response.json()["responses"]
+        assert [sub_response["path"] for sub_response in responses] == ["/hello", "/admin/status", "/does/not/exist"], \
+            "Failed to keep the order of the sub-requests."
+        assert responses[0]["status"] == 200, "Failed to get the correct status for the hello request."
+        assert responses[0]["body"] == {"hello": "world"}, "Failed to get the correct body for the hello request."
+        assert responses[1]["body"]["Running"], "Failed to get the correct body for the status request."
+        assert responses[2]["status"] == 404, "Failed to get the correct status for the unknown request."
+
+    def test_invalid_batch(self, host_url: str):
+        """
+        Test to ensure invalid batches are rejected.
+        """
+        for batch in [{"requests": []}, {"requests": [{"path": "/batch"}]}, {"requests": [{"path": "hello"}]}, {}]:
+            response = requests.post(f"{host_url}/batch", json=batch)
+            assert response.status_code == 400, f"Failed to reject the invalid batch {batch}."
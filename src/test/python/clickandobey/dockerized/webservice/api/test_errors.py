@@ -0,0 +1,138 @@
+"""
+Module used to test the error handling pipeline of the api.
+"""
+
+import logging
+import time
+
+import pytest
+
+from werkzeug.exceptions import NotFound
+
+from clickandobey.dockerized.webservice.api import errors
+from clickandobey.dockerized.webservice.api.app import API
+from clickandobey.dockerized.webservice.api.endpoints.admin import configuration
+from clickandobey.dockerized.webservice.api.logger import LOGGER
+from clickandobey.dockerized.webservice.api.errors import ErrorLogSampler
+
+
+class RecordingHandler(logging.Handler):
+    """
+    Handler keeping every record it was given.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.mark.unit
+@pytest.mark.ErrorHandling
+class TestErrorHandling:
+    """
+    Class used to test the error handling pipeline.
+    """
+
+    @pytest.fixture()
+    def client(self):
+        """
+        Return a test client for the flask app.
+        """
+        with API.test_client() as client:
+            yield client
+
+    def test_sampler(self):
+        """
+        Test to ensure the sampler logs the burst, then only powers of two, and reports what it suppressed.
+        """
+        sampler = ErrorLogSampler(burst=2, window_seconds=1000)
+        sampled = [sampler.sample("key")[0] for _ in range(16)]
+        assert [index + 1 for index, should_log in enumerate(sampled) if should_log] == [1, 2, 4, 8, 16], \
+            "Failed to sample the burst and the powers of two."
+        assert sampler.sample("other") == (True, 0), "Failed to sample each key separately."
+
+        sampler = ErrorLogSampler(burst=0, window_seconds=0.05)
+        # Occurrences 1 and 2 are powers of two, only the third one is suppressed.
+        for _ in range(3):
+            sampler.sample("key")
+        time.sleep(0.1)
+        assert sampler.sample("key") == (True, 1), \
+            "Failed to start a new window reporting the suppressed occurrences of the previous one."
+
+    def test_status_codes(self):
+        """
+        Test to ensure exceptions map to the status of their closest mapped parent.
+        """
+        # pylint: disable=protected-access
+        assert errors._get_status_code(ValueError) == 400, "Failed to map ValueError."
+        assert errors._get_status_code(UnicodeDecodeError) == 400, "Failed to map a ValueError subclass."
+        assert errors._get_status_code(TimeoutError) == 504, "Failed to map TimeoutError."
+        assert errors._get_status_code(KeyError) == 500, "Failed to default to an internal server error."
+
+    def test_unmatched_route(self, client):
+        """
+        Test to ensure unmatched routes get a pre-serialized JSON body.
+        """
+        response = client.get("/does/not/exist")
+        assert response.status_code == 404, "Failed to get the correct status for an unmatched route."
+        assert response.is_json, "Failed to return a JSON body."
+        assert response.get_json() == {"message": NotFound.description}, "Failed to get the correct body."
+
+    def test_forwarded_headers(self, client):
+        """
+        Test to ensure the headers of HTTP exceptions are forwarded, but not their content type.
+        """
+        response = client.delete("/hello")
+        assert response.status_code == 405, "Failed to get the correct status for an unsupported method."
+        assert "GET" in response.headers["Allow"], "Failed to forward the Allow header."
+        assert response.is_json, "Failed to keep the JSON content type."
+
+    def test_client_error(self, client, monkeypatch):
+        """
+        Test to ensure client errors expose their message.
+        """
+        def raise_value_error():
+            raise ValueError("Invalid value.")
+
+        monkeypatch.setattr(configuration, "get_configuration", raise_value_error)
+        response = client.get("/admin/configuration")
+        assert response.status_code == 400, "Failed to map the ValueError to a bad request."
+        assert response.get_json()["message"] == "Invalid value.", "Failed to expose the client error message."
+
+    def test_server_error(self, client, monkeypatch):
+        """
+        Test to ensure server errors hide their message.
+        """
+        def raise_runtime_error():
+            raise RuntimeError("Secret internals.")
+
+        monkeypatch.setattr(configuration, "get_configuration", raise_runtime_error)
+        response = client.get("/admin/configuration")
+        assert response.status_code == 500, "Failed to map the RuntimeError to an internal server error."
+        assert response.get_json()["message"] == "Internal Server Error", "Failed to hide the server error message."
+
+    def test_error_storm(self, client, monkeypatch):
+        """
+        Test to ensure a storm of server errors only produces the sampled logs of the pipeline.
+        """
+        def raise_runtime_error():
+            raise RuntimeError("Dependency failed.")
+
+        monkeypatch.setattr(configuration, "get_configuration", raise_runtime_error)
+        flask_handler = RecordingHandler()
+        pipeline_handler = RecordingHandler()
+        API.logger.addHandler(flask_handler)
+        LOGGER.addHandler(pipeline_handler)
+        try:
+            for _ in range(200):
+                client.get("/admin/configuration")
+        finally:
+            API.logger.removeHandler(flask_handler)
+            LOGGER.removeHandler(pipeline_handler)
+
+        assert not flask_handler.records, "Failed to keep flask from logging every server error."
+        error_records = [record for record in pipeline_handler.records if record.levelno == logging.ERROR]
+        assert 0 < len(error_records) < 50, "Failed to sample the server error logs."
@@ -5,7 +5,12 @@ Module used to test the base configuration class.
 import os
 import pytest
 
-from clickandobey.dockerized.webservice.configuration.webservice_configuration import WebserviceConfiguration
+from clickandobey.dockerized.webservice.configuration.webservice_configuration import (
+    WebserviceConfiguration,
+    WebserviceSettings,
+    load_configuration_file,
+    parse_settings,
+)
 
 
 @pytest.mark.unit
@@ -73,3 +78,62 @@ class TestWebserviceConfiguration:
             "Configuration": {}
         }
         assert configuration.to_dict() == expected_dict, "Failed to match the expected dictionary output for the config"
+
+    def test_settings(self):
+        """
+        Test to ensure the configuration is validated into typed settings.
+        """
+        configuration = WebserviceConfiguration("1.0.0", "env", {"debug": True, "foo": "bar"})
+        assert configuration.settings == WebserviceSettings(debug=True), "Failed to get the right settings."
+        assert configuration.debug, "Failed to get the debug setting."
+
+        with pytest.raises(AttributeError):
+            configuration.settings.debug = False
+
+        with pytest.raises(TypeError):
+            parse_settings({"debug": "yes"})
+
+    def test_load_configuration_file(self, tmp_path, monkeypatch):
+        """
+        Test to ensure configuration files are cached until they change.
+        """
+        cache_directory = tmp_path / "cache"
+        monkeypatch.setenv("CONFIGURATION_CACHE_DIRECTORY", str(cache_directory))
+        configuration_file = tmp_path / "config.yaml"
+        configuration_file.write_text("debug: true\n")
+
+        assert load_configuration_file(str(configuration_file)) == {"debug": True}, "Failed to load the file."
+        assert len(os.listdir(cache_directory)) == 1, "Failed to cache the loaded file."
+        assert load_configuration_file(str(configuration_file)) == {"debug": True}, "Failed to load the cache."
+
+        configuration_file.write_text("debug: false\nother: 1\n")
+        assert load_configuration_file(str(configuration_file)) == {"debug": False, "other": 1}, \
+            "Failed to invalidate the cache when the file changed."
+
+        configuration_file.write_text("")
+        assert load_configuration_file(str(configuration_file)) == {}, "Failed to load an empty file."
+
+    def test_configuration_cache_files(self, tmp_path, monkeypatch):
+        """
+        Test to ensure stale and failed cache files are removed, and shared cache directories are never trusted.
+        """
+        cache_directory = tmp_path / "cache"
+        monkeypatch.setenv("CONFIGURATION_CACHE_DIRECTORY", str(cache_directory))
+        configuration_file = tmp_path / "config.yaml"
+
+        configuration_file.write_text("debug: true\n")
+        load_configuration_file(str(configuration_file))
+        configuration_file.write_text("debug: false\n")
+        load_configuration_file(str(configuration_file))
+        assert len(os.listdir(cache_directory)) == 1, "Failed to prune the cache of the previous version of the file."
+
+        # Marshal can't serialize dates, so the file can't be cached.
+        configuration_file.write_text("date: 2020-01-01\n")
+        assert str(load_configuration_file(str(configuration_file))["date"]) == "2020-01-01", "Failed to load the file."
+        assert len(os.listdir(cache_directory)) == 1, "Failed to remove the temporary cache file."
+
+        cache_files = os.listdir(cache_directory)
+        cache_directory.chmod(0o777)
+        configuration_file.write_text("debug: true\n")
+        assert load_configuration_file(str(configuration_file)) == {"debug": True}, "Failed to load the file."
+        assert os.listdir(cache_directory) == cache_files, "Failed to ignore a cache directory shared with others."
@@ -0,0 +1,174 @@
+"""
+Module used to test the rate limiting log filter.
+"""
+
+import logging
+import time
+
+import pytest
+
+from clickandobey.dockerized.webservice.logging.log_filter import SAMPLED_ATTRIBUTE, RateLimitingFilter
+
+
+class FakeClock:
+    """
+    Clock that only moves when told to.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingHandler(logging.Handler):
+    """
+    Handler keeping every record it was given.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.mark.unit
+@pytest.mark.LogFilter
+class TestRateLimitingFilter:
+    """
+    Class used to test the RateLimitingFilter class.
+    """
+
+    @pytest.fixture()
+    def clock(self) -> FakeClock:
+        """
+        Return a fake clock for the filter.
+        """
+        yield FakeClock()
+
+    @pytest.fixture()
+    def logger_and_handler(self, request):
+        """
+        Return a logger with a recording handler attached, cleaning it up afterwards.
+        """
+        logger = logging.getLogger(f"test_log_filter.{request.node.name}")
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        handler = RecordingHandler()
+        logger.addHandler(handler)
+        yield logger, handler
+        logger.removeHandler(handler)
+        for log_filter in list(logger.filters):
+            logger.removeFilter(log_filter)
+
+    def test_burst_then_throttle(self, clock: FakeClock, logger_and_handler):
+        """
+        Test to ensure only the burst goes through at once, and tokens are refilled over time.
+        """
+        logger, handler = logger_and_handler
+        log_filter = RateLimitingFilter(rate=2.0, burst=3, summary_interval_seconds=1000, clock=clock)
+        logger.addFilter(log_filter)
+
+        for index in range(10):
+            logger.info("Repeated %i", index)
+        assert len(handler.records) == 3, "Failed to limit the records to the burst size."
+        assert log_filter.total_suppressed == 7, "Failed to count the suppressed records."
+
+        logger.warning("Repeated %i", 0)
+        assert len(handler.records) == 4, "Failed to keep a separate bucket per level."
+
+        clock.now = 1.0
+        for index in range(10):
+            logger.info("Repeated %i", index)
+        assert len(handler.records) == 6, "Failed to refill the bucket at the configured rate."
+
+    def test_summary(self, clock: FakeClock, logger_and_handler):
+        """
+        Test to ensure suppressed records are summarized and reported once the interval passed.
+        """
+        logger, handler = logger_and_handler
+        reported = []
+        log_filter = RateLimitingFilter(
+            rate=0.0,
+            burst=1,
+            summary_interval_seconds=10,
+            on_suppressed=lambda template, level, count: reported.append((template, level, count)),
+            clock=clock,
+        )
+        logger.addFilter(log_filter)
+
+        for _ in range(5):
+            logger.error("Dependency failed.")
+        assert len(handler.records) == 1, "Failed to suppress the repeated records."
+        assert not reported, "Failed to wait for the summary interval."
+
+        clock.now = 10.0
+        logger.error("Dependency failed.")
+        messages = [record.getMessage() for record in handler.records]
+        assert len(messages) == 2, "Failed to emit the summary."
+        assert messages[1].startswith("Suppressed 5 log records like 'Dependency failed.'"), \
+            "Failed to get the right summary message."
+        assert handler.records[1].levelno == logging.ERROR, "Failed to summarize at the suppressed level."
+        assert reported == [("Dependency failed.", logging.ERROR, 5)], "Failed to report the suppressed count."
+
+    def test_sampled_records(self, clock: FakeClock, logger_and_handler):
+        """
+        Test to ensure records already sampled by the caller are never throttled, nor throttle others.
+        """
+        logger, handler = logger_and_handler
+        log_filter = RateLimitingFilter(rate=0.0, burst=1, summary_interval_seconds=1000, clock=clock)
+        logger.addFilter(log_filter)
+
+        for index in range(5):
+            logger.error("%s raised", f"Error{index}", extra={SAMPLED_ATTRIBUTE: True})
+        logger.error("%s raised", "Unsampled")
+        assert len(handler.records) == 6, "Failed to let the sampled records through."
+        assert log_filter.total_suppressed == 0, "Failed to keep the sampled records out of the buckets."
+
+    def test_periodic_summary(self, logger_and_handler):
+        """
+        Test to ensure suppressed records are summarized even if no other record is logged afterwards.
+        """
+        logger, handler = logger_and_handler
+        log_filter = RateLimitingFilter(rate=0.0, burst=1, summary_interval_seconds=0.05)
+        logger.addFilter(log_filter)
+
+        for _ in range(3):
+            logger.error("Dependency failed.")
+
+        deadline = time.monotonic() + 2
+        while len(handler.records) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        log_filter.reset()
+        messages = [record.getMessage() for record in handler.records]
+        assert len(messages) == 2, "Failed to emit the summary in the background."
+        assert messages[1].startswith("Suppressed 2 log records like 'Dependency failed.'"), \
+            "Failed to get the right summary message."
+
+    def test_summary_sleep_follows_patching(self, logger_and_handler, monkeypatch):
+        """
+        Test to ensure the summary thread sleeps through the time module, so it follows monkey patching (i.e. gevent
+        patching a worker after the filter was imported by its master).
+        """
+        logger, handler = logger_and_handler
+        unpatched_sleep = time.sleep
+        sleeps = []
+
+        def patched_sleep(seconds: float) -> None:
+            sleeps.append(seconds)
+            unpatched_sleep(seconds)
+
+        monkeypatch.setattr(time, "sleep", patched_sleep)
+        log_filter = RateLimitingFilter(rate=0.0, burst=1, summary_interval_seconds=0.05)
+        logger.addFilter(log_filter)
+        for _ in range(2):
+            logger.error("Dependency failed.")
+
+        deadline = time.monotonic() + 2
+        while len(handler.records) < 2 and time.monotonic() < deadline:
+            unpatched_sleep(0.01)
+        log_filter.reset()
+        assert 0.05 in sleeps, "Failed to sleep through the patched time module."
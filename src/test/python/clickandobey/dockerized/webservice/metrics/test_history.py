@@ -0,0 +1,116 @@
+"""
+Module used to test the metrics history.
+"""
+
+import os
+import time
+import pytest
+
+from clickandobey.dockerized.webservice.metrics import history as history_module
+from clickandobey.dockerized.webservice.metrics.history import (
+    COUNT_KIND,
+    TIMER_KIND,
+    Aggregate,
+    MetricsHistory,
+    read_history,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.MetricsHistory
+class TestMetricsHistory:
+    """
+    Class used to test the MetricsHistory class.
+    """
+
+    def test_aggregate(self):
+        """
+        Test to ensure aggregates estimate percentiles and merge as expected.
+        """
+        aggregate = Aggregate()
+        for value in range(1, 101):
+            aggregate.add(value)
+        assert aggregate.count == 100, "Failed to count the values."
+        assert aggregate.total == 5050, "Failed to sum the values."
+        assert 40 <= aggregate.percentile(50) <= 60, "Failed to estimate the median."
+        assert aggregate.percentile(100) == 100, "Failed to clamp the percentile to the maximum."
+
+        other = Aggregate()
+        other.add(1000)
+        aggregate.merge(other)
+        assert aggregate.count == 101, "Failed to merge the counts."
+        assert aggregate.maximum == 1000, "Failed to merge the maximums."
+        assert Aggregate().percentile(50) is None, "Failed to handle an empty aggregate."
+
+    def test_record_and_read(self, tmp_path):
+        """
+        Test to ensure recorded metrics are read back, merged across ring files.
+        """
+        first_history = MetricsHistory(str(tmp_path), capacity=16)
+        second_history = MetricsHistory(str(tmp_path), capacity=16)
+        for value in (1, 2, 3):
+            first_history.record("Hello World Timer", TIMER_KIND, value)
+        first_history.record("Other Counter", COUNT_KIND, 1)
+        first_history.flush(force=True)
+
+        # Histories are keyed by pid, so simulate a second worker by moving the first ring file aside.
+        ring_file = os.path.join(str(tmp_path), f"metrics-{os.getpid()}.ring")
+        os.rename(ring_file, os.path.join(str(tmp_path), "metrics-0.ring"))
+        second_history.record("Hello World Timer", TIMER_KIND, 10)
+        second_history.flush(force=True)
+
+        points = read_history(str(tmp_path), "Hello World Timer", window_seconds=120, now=time.time() + 1)
+        assert sum(point["Count"] for point in points) == 4, "Failed to merge the histories of both ring files."
+        assert sum(point["Sum"] for point in points) == 16, "Failed to sum the values of both ring files."
+        assert {point["Kind"] for point in points} == {"timer"}, "Failed to filter the history by metric."
+
+        points = read_history(str(tmp_path), "Hello World Timer", window_seconds=120, resolution=60,
+                              now=time.time() + 60)
+        assert sum(point["Count"] for point in points) == 4, "Failed to record the per minute aggregates."
+
+        with pytest.raises(ValueError):
+            read_history(str(tmp_path), "Hello World Timer", resolution=5)
+
+    def test_ring_wraps(self, tmp_path):
+        """
+        Test to ensure the ring file never grows and keeps the most recent records.
+        """
+        history = MetricsHistory(str(tmp_path), capacity=4)
+        for index in range(10):
+            history.record(f"Counter {index}", COUNT_KIND, 1)
+        history.flush(force=True)
+
+        ring_file = os.path.join(str(tmp_path), f"metrics-{os.getpid()}.ring")
+        size = os.path.getsize(ring_file)
+        history.record("Counter 0", COUNT_KIND, 1)
+        history.flush(force=True)
+        assert os.path.getsize(ring_file) == size, "Failed to keep the ring file at a constant size."
+
+        now = time.time() + 1
+        assert not read_history(str(tmp_path), "Counter 1", window_seconds=120, now=now), \
+            "Failed to overwrite the oldest records."
+        assert read_history(str(tmp_path), "Counter 0", window_seconds=120, now=now), \
+            "Failed to keep the most recent records."
+
+    def test_read_window(self, tmp_path, monkeypatch):
+        """
+        Test to ensure records and ring files older than the window are skipped.
+        """
+        now = time.time()
+        history = MetricsHistory(str(tmp_path), capacity=16)
+        monkeypatch.setattr(history_module.time, "time", lambda: now - 3600)
+        history.record("Counter", COUNT_KIND, 1)
+        history.flush(force=True)
+        monkeypatch.setattr(history_module.time, "time", lambda: now)
+        history.record("Counter", COUNT_KIND, 2)
+        history.flush(force=True)
+
+        points = read_history(str(tmp_path), "Counter", window_seconds=120, now=now + 1)
+        assert [point["Sum"] for point in points] == [2], "Failed to skip the records older than the window."
+        points = read_history(str(tmp_path), "Counter", window_seconds=7200, now=now + 1)
+        assert [point["Sum"] for point in points] == [1, 2], "Failed to read the records within the window."
+
+        ring_file = os.path.join(str(tmp_path), f"metrics-{os.getpid()}.ring")
+        os.utime(ring_file, (now - 3600, now - 3600))
+        assert not read_history(str(tmp_path), "Counter", window_seconds=120, now=now + 1), \
+            "Failed to skip the ring files not written to since before the window."
@@ -0,0 +1,133 @@
+"""
+Module used to test the hooks of the gunicorn configuration.
+"""
+
+import gc
+import logging
+import signal
+
+from time import monotonic
+from types import SimpleNamespace
+
+import pytest
+
+from clickandobey.dockerized.webservice.api.app import API
+from clickandobey.dockerized.webservice.server import gunicorn_config, lifecycle
+
+
+class FakeApp:
+    """
+    Gunicorn application loading the flask app, recording whether it was loaded.
+    """
+
+    def __init__(self):
+        self.loaded = False
+
+    def wsgi(self):
+        """
+        Return the flask app.
+        """
+        self.loaded = True
+        return API
+
+
+@pytest.mark.unit
+@pytest.mark.GunicornConfig
+class TestGunicornConfig:
+    """
+    Class used to test the gunicorn configuration hooks.
+    """
+
+    @staticmethod
+    def __create_server(preload_app: bool, worker_class: str = "sync") -> SimpleNamespace:
+        return SimpleNamespace(
+            cfg=SimpleNamespace(preload_app=preload_app, graceful_timeout=1, worker_class_str=worker_class),
+            app=FakeApp(),
+            log=logging.getLogger(__name__),
+        )
+
+    @staticmethod
+    def __create_worker(preload_app: bool) -> SimpleNamespace:
+        worker = SimpleNamespace(
+            cfg=SimpleNamespace(preload_app=preload_app, graceful_timeout=1),
+            wsgi=API,
+            log=logging.getLogger(__name__),
+            pid=1234,
+            exit_signals=[],
+        )
+        worker.handle_exit = lambda signum, frame: worker.exit_signals.append(signum)
+        return worker
+
+    @pytest.mark.parametrize("preload_app", [True, False])
+    def test_when_ready(self, preload_app: bool):
+        """
+        Test to ensure the master only warms up the app when it is preloaded.
+        """
+        server = self.__create_server(preload_app)
+        gunicorn_config.when_ready(server)
+        assert server.app.loaded == preload_app, "Failed to only warm up the preloaded app."
+
+    def test_when_ready_unpatched(self):
+        """
+        Test to ensure the master refuses to fork gevent workers from an app it preloaded without being patched.
+        """
+        server = self.__create_server(True, "gevent")
+        with pytest.raises(RuntimeError):
+            gunicorn_config.when_ready(server)
+        assert not server.app.loaded, "Failed to refuse warming up the app."
+
+        gunicorn_config.when_ready(self.__create_server(False, "gevent"))
+
+    @pytest.mark.parametrize("preload_app", [True, False])
+    def test_pre_fork(self, preload_app: bool):
+        """
+        Test to ensure the master only freezes its heap when the app is preloaded.
+        """
+        try:
+            gunicorn_config.pre_fork(self.__create_server(preload_app), None)
+            assert (gc.get_freeze_count() > 0) == preload_app, "Failed to only freeze the heap of a preloaded app."
+        finally:
+            gc.unfreeze()
+
+    @pytest.mark.parametrize("preload_app", [True, False])
+    def test_post_worker_init(self, preload_app: bool, monkeypatch):
+        """
+        Test to ensure workers re-initialize their state, get ready, and drain on the drain signals.
+        """
+        handlers = {}
+        post_fork_calls = []
+        monkeypatch.setattr(signal, "signal", lambda signum, handler: handlers.update({signum: handler}))
+        monkeypatch.setattr(lifecycle, "__POST_FORK_CALLBACKS", [lambda: post_fork_calls.append(True)])
+        lifecycle.mark_draining()
+
+        worker = self.__create_worker(preload_app)
+        gunicorn_config.post_worker_init(worker)
+        assert post_fork_calls, "Failed to run the post fork callbacks."
+        assert lifecycle.is_ready(), "Failed to mark the worker as ready."
+        assert set(handlers) == {signal.SIGTERM, signal.SIGHUP}, "Failed to install the drain signal handlers."
+
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
+        assert not lifecycle.is_ready(), "Failed to mark the worker as draining."
+        assert worker.exit_signals == [signal.SIGTERM], "Failed to let the worker exit."
+
+        drain_deadline = worker.drain_deadline
+        handlers[signal.SIGTERM](signal.SIGTERM, None)
+        assert worker.drain_deadline == drain_deadline, "Failed to keep the deadline of the first drain signal."
+        assert worker.exit_signals == [signal.SIGTERM], "Failed to ignore the repeated drain signal."
+
+    def test_worker_exit(self, monkeypatch):
+        """
+        Test to ensure exiting workers only wait for their in-flight requests until the drain deadline, then shut down.
+        """
+        shutdowns = []
+        monkeypatch.setattr(gunicorn_config, "run_shutdown", lambda logger: shutdowns.append(True))
+        lifecycle._reset_requests_state()  # pylint: disable=protected-access
+        lifecycle.request_started()
+
+        worker = self.__create_worker(True)
+        worker.drain_deadline = monotonic() + 0.05
+        started = monotonic()
+        gunicorn_config.worker_exit(self.__create_server(True), worker)
+        assert monotonic() - started < worker.cfg.graceful_timeout, "Failed to only wait until the drain deadline."
+        assert shutdowns, "Failed to run the shutdown callbacks."
+        lifecycle.request_finished()
@@ -0,0 +1,76 @@
+"""
+Module used to test the lifecycle utilities of the webservice processes.
+"""
+
+import gc
+import threading
+
+import pytest
+
+from clickandobey.dockerized.webservice.server import lifecycle
+
+
+@pytest.mark.unit
+@pytest.mark.Lifecycle
+class TestLifecycle:
+    """
+    Class used to test the lifecycle module.
+    """
+
+    def test_readiness(self):
+        """
+        Test to ensure processes start cold after forking, and can be marked as ready and draining.
+        """
+        lifecycle._reset_requests_state()  # pylint: disable=protected-access
+        assert not lifecycle.is_ready(), "Failed to start as not ready."
+
+        lifecycle.mark_ready()
+        assert lifecycle.is_ready(), "Failed to mark the process as ready."
+
+        lifecycle.mark_draining()
+        assert not lifecycle.is_ready(), "Failed to mark the process as draining."
+
+    def test_wait_for_in_flight_requests(self):
+        """
+        Test to ensure draining waits for the in-flight requests, up to the timeout.
+        """
+        lifecycle._reset_requests_state()  # pylint: disable=protected-access
+        assert lifecycle.wait_for_in_flight_requests(0), "Failed to return right away without requests."
+
+        lifecycle.request_started()
+        assert lifecycle.get_in_flight_requests() == 1, "Failed to track the in-flight request."
+        assert not lifecycle.wait_for_in_flight_requests(0.01), "Failed to time out on the in-flight request."
+
+        timer = threading.Timer(0.05, lifecycle.request_finished)
+        timer.start()
+        assert lifecycle.wait_for_in_flight_requests(5), "Failed to wait for the in-flight request."
+        timer.join()
+        assert lifecycle.get_in_flight_requests() == 0, "Failed to track the finished request."
+
+    def test_post_fork_callbacks(self, monkeypatch):
+        """
+        Test to ensure every post fork callback runs in order, even if one of them fails.
+        """
+        calls = []
+
+        def failing_callback():
+            calls.append("failing")
+            raise RuntimeError("Failed to re-initialize.")
+
+        monkeypatch.setattr(lifecycle, "__POST_FORK_CALLBACKS", [])
+        lifecycle.register_post_fork(lambda: calls.append("first"))
+        lifecycle.register_post_fork(failing_callback)
+        lifecycle.register_post_fork(lambda: calls.append("last"))
+
+        lifecycle.run_post_fork()
+        assert calls == ["first", "failing", "last"], "Failed to run every post fork callback in order."
+
+    def test_freeze_heap(self):
+        """
+        Test to ensure the heap gets moved to the permanent generation.
+        """
+        try:
+            lifecycle.freeze_heap()
+            assert gc.get_freeze_count() > 0, "Failed to freeze the heap."
+        finally:
+            gc.unfreeze()
@@ -0,0 +1,164 @@
+"""
+Module used to test restarting the workers of the webservice while it is under load.
+"""
+
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+
+from typing import List, Sequence
+
+import pytest
+import requests
+
+PORT = 9102
+HOST_URL = f"http://localhost:{PORT}"
+
+
+class LoadGenerator:
+    """
+    Class sending requests to the webservice from several threads until stopped, recording every failed request.
+    Requests are sent without a session, so each one opens a new connection like an independent client would.
+    """
+
+    def __init__(self, host_url: str, paths: Sequence[str], concurrency: int = 4, timeout_seconds: float = 10):
+        self.__host_url = host_url
+        self.__paths = paths
+        self.__concurrency = concurrency
+        self.__timeout_seconds = timeout_seconds
+        self.__stop_event = threading.Event()
+        self.__lock = threading.Lock()
+        self.__threads: List[threading.Thread] = []
+        self.successes = 0
+        self.failures: List[str] = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Start sending requests.
+        """
+        self.__stop_event.clear()
+        self.__threads = [threading.Thread(target=self.__run, daemon=True) for _ in range(self.__concurrency)]
+        for thread in self.__threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop sending requests, waiting for the pending ones.
+        """
+        self.__stop_event.set()
+        for thread in self.__threads:
+            thread.join()
+
+    def __run(self) -> None:
+        index = 0
+        while not self.__stop_event.is_set():
+            path = self.__paths[index % len(self.__paths)]
+            index += 1
+            try:
+                response = requests.get(f"{self.__host_url}{path}", timeout=self.__timeout_seconds)
+                failure = None if response.status_code == 200 else f"{path}: {response.status_code}"
+            except requests.RequestException as ex:
+                failure = f"{path}: {ex}"
+
+            with self.__lock:
+                if failure is None:
+                    self.successes += 1
+                else:
+                    self.failures.append(failure)
+
+
+def _get_workers(pid: int) -> List[int]:
+    workers = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as stat_file:
+                # The parent pid is the 4th field, after the (possibly spaced) command name in parentheses.
+                parent_pid = int(stat_file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if parent_pid == pid:
+            workers.append(int(entry))
+    return workers
+
+
+def _wait_for_workers(process: subprocess.Popen, workers: int, timeout_seconds: float = 60) -> None:
+    # Readiness is checked apart from the load: workers answer 503 while they drain, which is expected.
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        assert process.poll() is None, "Gunicorn exited unexpectedly."
+        if len(_get_workers(process.pid)) == workers:
+            try:
+                if requests.get(f"{HOST_URL}/admin/status", timeout=1).status_code == 200:
+                    return
+            except requests.RequestException:
+                pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Workers failed to be ready after {timeout_seconds} seconds.")
+
+
+@pytest.mark.integration
+@pytest.mark.system
+@pytest.mark.RollingRestart
+class TestRollingRestart:
+    """
+    Class used to test restarting the workers of the webservice while it is under load.
+    """
+
+    @pytest.fixture()
+    def gunicorn(self) -> subprocess.Popen:
+        """
+        Run the webservice with gunicorn, stopping it afterwards.
+        """
+        # Older versions of gunicorn can't be run as a module, so run its script.
+        executable = shutil.which("gunicorn")
+        assert executable, "Failed to find gunicorn."
+        environment = dict(os.environ, PORT=str(PORT), WORKERS="2", GRACEFUL_TIMEOUT="10")
+        process = subprocess.Popen(  # pylint: disable=consider-using-with
+            [
+                executable,
+                "--config", "python:clickandobey.dockerized.webservice.server.gunicorn_config",
+                "clickandobey.dockerized.webservice.api.app:API",
+            ],
+            env=environment,
+        )
+        try:
+            _wait_for_workers(process, 2)
+            yield process
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def test_rolling_restart(self, gunicorn: subprocess.Popen):
+        """
+        Test to ensure no request fails while the workers are reloaded and restarted one by one.
+        """
+        with LoadGenerator(HOST_URL, ["/hello", "/admin/configuration"]) as load_generator:
+            time.sleep(1)
+
+            # Reload every worker through the master.
+            gunicorn.send_signal(signal.SIGHUP)
+            time.sleep(3)
+            _wait_for_workers(gunicorn, 2)
+
+            # Restart the workers one at a time.
+            for worker in _get_workers(gunicorn.pid):
+                os.kill(worker, signal.SIGTERM)
+                time.sleep(1)
+                _wait_for_workers(gunicorn, 2)
+
+            time.sleep(1)
+
+        assert load_generator.successes > 0, "Failed to send any request."
+        assert not load_generator.failures, f"Failed requests during the rolling restart: {load_generator.failures}"